@@ -50,6 +50,11 @@ class DatabaseConfig:
             'read_timeout': 30,
             'write_timeout': 30
         }
+    
+    @property
+    def POOL_SIZE(self) -> int:
+        """Idle connections kept open per database"""
+        return int(os.getenv('DB_POOL_SIZE', '10'))
 
 @dataclass
 class ChromaConfig:
@@ -59,10 +64,23 @@ class ChromaConfig:
     def CHROMA_CONFIG(self) -> Dict[str, Any]:
         return {
             'persist_directory': os.getenv('CHROMA_PERSIST_DIR', './chroma_data'),
+            'shadow_path': os.getenv('CHROMA_SHADOW_DB', os.path.join(os.getenv('CHROMA_PERSIST_DIR', './chroma_data'), 'chroma_shadow.db')),
             'collection_name': os.getenv('CHROMA_COLLECTION', 'observatorio_research'),
             'host': os.getenv('CHROMA_HOST', 'localhost'),
             'port': int(os.getenv('CHROMA_PORT', '8000')),
-            'use_server': os.getenv('CHROMA_USE_SERVER', 'false').lower() == 'true'
+            'use_server': os.getenv('CHROMA_USE_SERVER', 'false').lower() == 'true',
+            'batch_size': int(os.getenv('CHROMA_BATCH_SIZE', '100')),
+            'flush_interval': float(os.getenv('CHROMA_FLUSH_INTERVAL', '5')),
+            'async_chunk_size': int(os.getenv('CHROMA_ASYNC_CHUNK_SIZE', '25')),
+            'max_concurrent_writes': int(os.getenv('CHROMA_MAX_CONCURRENT_WRITES', '8')),
+            # HNSW index parameters, only applied when the collection is first created
+            'hnsw_construction_ef': int(os.getenv('CHROMA_HNSW_CONSTRUCTION_EF', '100')),
+            'hnsw_m': int(os.getenv('CHROMA_HNSW_M', '16')),
+            'hnsw_sync_threshold': int(os.getenv('CHROMA_HNSW_SYNC_THRESHOLD', '5000')),
+            'semantic_cache_threshold': float(os.getenv('CHROMA_SEMANTIC_CACHE_THRESHOLD', '0.95')),
+            'semantic_cache_size': int(os.getenv('CHROMA_SEMANTIC_CACHE_SIZE', '1024')),
+            'finding_cache_size': int(os.getenv('CHROMA_FINDING_CACHE_SIZE', '4096')),
+            'finding_cache_ttl': float(os.getenv('CHROMA_FINDING_CACHE_TTL', '600'))
         }
 
 @dataclass
@@ -88,6 +106,11 @@ class ResearchConfig:
     @property
     def VALIDATION_THRESHOLD(self) -> float:
         return float(os.getenv('VALIDATION_THRESHOLD', '0.7'))
+    
+    @property
+    def VALIDATION_CONCURRENCY(self) -> int:
+        """Claims validated in parallel; the traffic pool keeps at least this many connections"""
+        return int(os.getenv('ETSO_VALIDATION_CONCURRENCY', '8'))
 
 class SystemConfig:
     """System-wide configuration"""
@@ -27,7 +27,6 @@ app.config['SECRET_KEY'] = 'observatorio-ets-secret-2024'
 system_config = SystemConfig()
 db_manager = DatabaseManager(system_config)
 storage_manager = ResearchStorageManager(db_manager, system_config)
-validator = DualDatabaseValidator(system_config, db_manager)
 
 # Initialize LLM
 llm = ChatOpenAI(
@@ -35,6 +34,7 @@ llm = ChatOpenAI(
     model=system_config.llm.OPENAI_CONFIG['model'],
     temperature=0.3
 )
+validator = DualDatabaseValidator(db_manager, llm)
 sql_builder = ValidationSQLBuilder(llm)
 
 @app.route('/')
@@ -1291,11 +1291,12 @@ def generate_claims(theme_id):
         for claim in claims:
             try:
                 # Generate validation query
-                query = validator.query_generator.generate_validation_query(claim, "2025Q1")
+                query, params = validator.query_generator.generate_validation_query(claim, "2025Q1")
+                rendered_query = validator.query_generator.render(query, params)
                 
                 # Test query execution
                 try:
-                    results = db_manager.execute_traffic_query(query)
+                    results = db_manager.execute_traffic_query(query, tuple(params))
                     data_points = len(results)
                 except Exception as e:
                     logger.warning(f"Query test failed for claim: {e}")
@@ -1309,7 +1310,7 @@ def generate_claims(theme_id):
                     'vessel_filter': claim.vessel or '',
                     'route_filter': claim.route or '',
                     'period_filter': claim.period or '',
-                    'validation_query': query,
+                    'validation_query': rendered_query,
                     'validation_logic': f'AI-generated query to validate: {claim.claim_text}',
                     'confidence_score': None,
                     'supports_claim': None,
@@ -1323,7 +1324,7 @@ def generate_claims(theme_id):
                     'id': claim_id,
                     'claim_text': claim.claim_text,
                     'claim_type': claim.claim_type,
-                    'validation_query': query,
+                    'validation_query': rendered_query,
                     'validation_logic': claim_data['validation_logic'],
                     'data_points_found': data_points,
                     'confidence_score': 0.0,
@@ -1374,7 +1375,7 @@ def build_sql_from_validation():
         
         return jsonify({
             'success': True,
-            'query': result.query,
+            'query': result.render(),
             'explanation': result.explanation,
             'confidence': result.confidence,
             'query_type': result.query_type,
@@ -4,9 +4,15 @@ Handles dual database connections: traffic_db (readonly) + etso_db (full access)
 """
 
 import pymysql
+import asyncio
+import hashlib
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Generator, Dict, Any, Optional
+from typing import Generator, Dict, Any, List, Optional, Tuple
 from config import SystemConfig
 
 logger = logging.getLogger(__name__)
@@ -14,29 +20,62 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     """Manages connections to both traffic and ETSO databases"""
     
+    # Server-side prepared statements kept per pooled connection (MySQL caps them per server)
+    MAX_PREPARED_PER_CONNECTION = 32
+    
     def __init__(self, config: SystemConfig):
         self.config = config
         self.traffic_config = config.database.TRAFFIC_DB
         self.etso_config = config.database.ETSO_DB
         
+        # Idle connections reused across queries instead of reconnecting every time; the traffic
+        # pool holds one per concurrently validated claim so none are closed between claims
+        pool_size = config.database.POOL_SIZE
+        traffic_pool_size = max(pool_size, config.research.VALIDATION_CONCURRENCY)
+        self._traffic_pool: queue.LifoQueue = queue.LifoQueue(maxsize=traffic_pool_size)
+        self._etso_pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        
         # Test connections on initialization
         self.test_connections()
     
+    def _acquire(self, pool: queue.LifoQueue, db_config: Dict[str, Any]) -> pymysql.Connection:
+        """Take an idle pooled connection, or open a new one"""
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                return pymysql.connect(**db_config)
+            try:
+                conn.ping(reconnect=True)
+                return conn
+            except Exception:
+                conn.close()
+    
+    def _release(self, pool: queue.LifoQueue, conn: pymysql.Connection):
+        """Return a connection to its pool, closing it if broken or the pool is full"""
+        try:
+            # Don't let an open transaction (and its snapshot) leak into the next query
+            if not conn.get_autocommit():
+                conn.rollback()
+            pool.put_nowait(conn)
+        except Exception:
+            conn.close()
+    
     @contextmanager
     def get_traffic_connection(self) -> Generator[pymysql.Connection, None, None]:
         """Get read-only connection to traffic database"""
         conn = None
         try:
             logger.debug("Connecting to traffic database (readonly)")
-            conn = pymysql.connect(**self.traffic_config)
+            conn = self._acquire(self._traffic_pool, self.traffic_config)
             yield conn
         except Exception as e:
             logger.error(f"Traffic database connection error: {e}")
             raise
         finally:
             if conn:
-                conn.close()
-                logger.debug("Traffic database connection closed")
+                self._release(self._traffic_pool, conn)
+                logger.debug("Traffic database connection released")
     
     @contextmanager
     def get_etso_connection(self) -> Generator[pymysql.Connection, None, None]:
@@ -44,15 +83,26 @@ class DatabaseManager:
         conn = None
         try:
             logger.debug("Connecting to ETSO database (full access)")
-            conn = pymysql.connect(**self.etso_config)
+            conn = self._acquire(self._etso_pool, self.etso_config)
             yield conn
         except Exception as e:
             logger.error(f"ETSO database connection error: {e}")
             raise
         finally:
             if conn:
-                conn.close()
-                logger.debug("ETSO database connection closed")
+                self._release(self._etso_pool, conn)
+                logger.debug("ETSO database connection released")
+    
+    def close(self):
+        """Close all idle pooled connections"""
+        for pool in (self._traffic_pool, self._etso_pool):
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                except Exception:
+                    continue
     
     def test_connections(self) -> bool:
         """Test both database connections"""
@@ -89,6 +139,48 @@ class DatabaseManager:
             cursor.execute(query, params or ())
             return cursor.fetchall()
     
+    def execute_traffic_query_prepared(self, query: str, params: tuple = ()) -> Tuple[List[str], list]:
+        """Execute read-only traffic query as a server-side prepared statement, prepared once per connection
+        
+        Returns (column names, rows).
+        """
+        name = 'stmt_' + hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+        
+        with self.get_traffic_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                self._prepare(conn, cursor, name, query)
+                if params:
+                    variables = [f"@p{i}" for i in range(1, len(params) + 1)]
+                    cursor.execute("SET " + ", ".join(f"{var} = %s" for var in variables), params)
+                    cursor.execute(f"EXECUTE {name} USING {', '.join(variables)}")
+                else:
+                    cursor.execute(f"EXECUTE {name}")
+            except pymysql.MySQLError as e:
+                logger.warning(f"⚠️  Prepared statement failed, running query directly: {e}")
+                cursor.execute(query, params or ())
+            return [d[0] for d in cursor.description or ()], cursor.fetchall()
+    
+    def _prepare(self, conn: pymysql.Connection, cursor, name: str, query: str):
+        """PREPARE query as name on this connection unless it already is"""
+        # Prepared statements die with the server session, so track them per session id
+        # (ping(reconnect=True) may have replaced the session behind this connection object)
+        session_id, prepared = getattr(conn, '_prepared_statements', (None, None))
+        if session_id != conn.thread_id():
+            prepared = OrderedDict()
+            conn._prepared_statements = (conn.thread_id(), prepared)
+        
+        if name in prepared:
+            prepared.move_to_end(name)
+            return
+        
+        # Server-side placeholders are ? rather than pymysql's %s
+        cursor.execute(f"PREPARE {name} FROM %s", (query.replace('%s', '?'),))
+        prepared[name] = None
+        if len(prepared) > self.MAX_PREPARED_PER_CONNECTION:
+            oldest, _ = prepared.popitem(last=False)
+            cursor.execute(f"DEALLOCATE PREPARE {oldest}")
+    
     def execute_etso_query(self, query: str, params: tuple = None, fetch: bool = True) -> Optional[list]:
         """Execute query on ETSO database with transaction support"""
         with self.get_etso_connection() as conn:
@@ -112,8 +204,82 @@ class DatabaseManager:
 class TrafficDataAccess:
     """Specialized class for traffic database queries"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, cache_size: int = 512):
         self.db_manager = db_manager
+        
+        # Results of recent queries keyed on (sql, params); escalas are append-only
+        # within a quarter, so entries only need to expire, not be invalidated
+        self._cache: 'OrderedDict[bytes, Tuple[float, Tuple[List[str], tuple]]]' = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+    
+    def query_cached(self, sql: str, params: tuple = (), ttl: float = 900) -> Tuple[List[str], tuple]:
+        """Execute a read-only traffic query, reusing identical results from the last ttl seconds
+        
+        Returns (column names, rows).
+        """
+        canonical = (' '.join(sql.split()), tuple(params))
+        key = hashlib.blake2b(repr(canonical).encode(), digest_size=16).digest()
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return cached[1]
+        
+        columns, rows = self.db_manager.execute_traffic_query_prepared(sql, tuple(params))
+        result = (columns, tuple(rows))
+        
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    async def aquery_cached(self, sql: str, params: tuple = (), ttl: float = 900) -> Tuple[List[str], tuple]:
+        """query_cached in a worker thread, overlapping DB latency with other claims' work"""
+        return await asyncio.to_thread(self.query_cached, sql, params, ttl)
+    
+    @contextmanager
+    def period_slice(self, period_filter: str, params: List[Any]):
+        """Materialize one period's container port calls into a session temporary table
+        
+        Yields (table, run) where run(sql, params) executes on the session holding the table
+        and returns (column names, rows),
+        or None when the table can't be created (e.g. the read-only user lacks CREATE TEMPORARY TABLES).
+        """
+        table = 'tmp_q_' + hashlib.blake2b(repr((period_filter, params)).encode(), digest_size=6).hexdigest()
+        
+        with self.db_manager.get_traffic_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                # Filters apply to the 'e' alias, so the slice keeps it; fleet_imo marks calls
+                # by vessels present in v_fleet for queries that inner-join it
+                cursor.execute(f"""
+                CREATE TEMPORARY TABLE {table} (INDEX (imo, portname)) AS
+                SELECT e.imo, v.imo AS fleet_imo, v.name, e.portname, e.next_port, e.start, e.end, m.co2nm
+                FROM escalas e
+                JOIN port_trace pt ON pt.imo = e.imo
+                LEFT JOIN v_fleet v ON e.imo = v.imo
+                LEFT JOIN v_MRV m ON e.imo = m.imo
+                WHERE 1=1
+                {period_filter}
+                """, tuple(params))
+            except pymysql.MySQLError as e:
+                logger.warning(f"⚠️  Could not materialize period slice, querying escalas directly: {e}")
+                yield None
+                return
+            
+            def run(sql: str, query_params: Tuple[Any, ...]) -> Tuple[List[str], tuple]:
+                cursor.execute(sql, query_params)
+                return [d[0] for d in cursor.description or ()], cursor.fetchall()
+            
+            try:
+                yield table, run
+            finally:
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {table}")
     
     def get_vessel_movements(self, imo: int, start_date: str, end_date: str) -> list:
         """Get vessel movements for specific IMO and date range"""
@@ -196,6 +362,11 @@ class ETSODataAccess:
             fetch=False
         )
     
+    def delete_research_metadata(self, research_id: int):
+        """Delete a research metadata row"""
+        query = "DELETE FROM research_metadata WHERE id = %s"
+        self.db_manager.execute_etso_query(query, (research_id,), fetch=False)
+    
     def get_research_metadata(self, research_id: int) -> Optional[dict]:
         """Get research metadata by ID"""
         query = """
@@ -235,6 +406,39 @@ class ETSODataAccess:
             query, (confidence, status, research_id), fetch=False
         )
     
+    def update_research_confidence_many(self, updates: List[Tuple[int, float, str]]):
+        """Update confidence score and status for several research rows in one statement"""
+        if not updates:
+            return 0
+        
+        confidence_cases = ' '.join(['WHEN %s THEN %s'] * len(updates))
+        status_cases = ' '.join(['WHEN %s THEN %s'] * len(updates))
+        placeholders = ', '.join(['%s'] * len(updates))
+        query = f"""
+        UPDATE research_metadata 
+        SET overall_confidence = CASE id {confidence_cases} END,
+            status = CASE id {status_cases} END,
+            updated_at = NOW()
+        WHERE id IN ({placeholders})
+        """
+        params = (
+            [value for research_id, confidence, _ in updates for value in (research_id, confidence)]
+            + [value for research_id, _, status in updates for value in (research_id, status)]
+            + [research_id for research_id, _, _ in updates]
+        )
+        return self.db_manager.execute_etso_query(query, tuple(params), fetch=False)
+    
+    def get_research_metadata_many(self, research_ids: List[int]) -> Dict[int, dict]:
+        """Get chroma_id and quarter for several research rows, keyed by ID"""
+        if not research_ids:
+            return {}
+        
+        placeholders = ', '.join(['%s'] * len(research_ids))
+        query = f"SELECT id, chroma_id, quarter FROM research_metadata WHERE id IN ({placeholders})"
+        result = self.db_manager.execute_etso_query(query, tuple(research_ids))
+        
+        return {row[0]: {'id': row[0], 'chroma_id': row[1], 'quarter': row[2]} for row in result or []}
+    
     def store_validation_claim(self, claim_data: Dict[str, Any]) -> int:
         """Store validation claim result"""
         query = """
@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
 
 # Local imports
@@ -107,17 +107,21 @@ class ResearchThemeProcessor:
     def _extract_json_from_response(self, response_text: str) -> Dict[str, Any]:
         """Extract JSON from LLM response"""
         import json
-        import re
+        
+        text = response_text.strip()
+        # Drop a ```json ... ``` fence around the payload
+        if text.startswith("```"):
+            text = text.split('\n', 1)[-1].rsplit("```", 1)[0].strip()
         
         try:
             # Try direct JSON parsing
-            return json.loads(response_text)
+            return json.loads(text)
         except json.JSONDecodeError:
-            # Try to find JSON block
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
+            # Try the outermost {...} block (same span a greedy DOTALL regex would match)
+            start, end = text.find('{'), text.rfind('}')
+            if start != -1 and end > start:
                 try:
-                    return json.loads(json_match.group())
+                    return json.loads(text[start:end + 1])
                 except json.JSONDecodeError:
                     pass
             
@@ -386,7 +390,10 @@ class ObservatorioETS:
         self.research_agent = ResearchAgent(self.llm)  # Legacy agent
         self.enhanced_research_agent = EnhancedMaritimeResearchAgent(self.db_manager, self.llm)  # New enhanced agent
         self.report_generator = ReportGenerationSystem(self.db_manager, self.llm)
-        self.validator = DualDatabaseValidator(self.db_manager, self.llm)
+        self.validator = DualDatabaseValidator(
+            self.db_manager, self.llm,
+            embeddings=OpenAIEmbeddings(model='text-embedding-3-small', api_key=llm_config['api_key'])
+        )
         self.insight_discovery = DataInsightDiscovery(self.db_manager)
         
         logger.info("🚀 OBSERVATORIO ETS initialized successfully")
@@ -595,25 +602,29 @@ class ObservatorioETS:
             # Phase 4: Validate research findings
             logger.info("🔄 Phase 4: Validating research findings")
             validation_results = []
-            
-            for result in research_results:
-                logger.info(f"🔎 Validating research ID: {result['research_id']}")
-                
-                validation_result = self.validator.validate_research_finding(
-                    research_metadata_id=result['research_id'],
-                    research_content=result['research_content'],
-                    validation_targets=result['theme'].validation_targets
-                )
-                
-                # Update confidence in storage
+            confidence_updates = []
+            
+            # Claims for every finding are extracted in one batched LLM round-trip
+            batch_results = await self.validator.avalidate_research_findings([
+                {
+                    'research_metadata_id': result['research_id'],
+                    'research_content': result['research_content'],
+                    'validation_targets': result['theme'].validation_targets
+                }
+                for result in research_results
+            ])
+            
+            for result, validation_result in zip(research_results, batch_results):
                 if validation_result.get('overall_confidence', 0) > 0:
-                    self.storage_manager.update_research_confidence(
-                        result['research_id'],
-                        validation_result['overall_confidence']
+                    confidence_updates.append(
+                        (result['research_id'], validation_result['overall_confidence'], 'completed')
                     )
                 
                 validation_results.append(validation_result)
             
+            # Update confidence in storage for all validated findings at once
+            self.storage_manager.update_research_confidence_many(confidence_updates)
+            
             # Phase 5: Generate summary
             logger.info("🔄 Phase 5: Generating quarterly summary")
             summary = await self._generate_quarterly_summary(
@@ -0,0 +1,84 @@
+-- OBSERVATORIO ETS - Migration: research_validation_summary
+-- Adds the trigger-maintained validation summary table to an existing ETSO database
+-- and backfills it from validation_claims. Safe to re-run.
+-- Apply with `python setup/schema_setup.py add_validation_summary.sql` (or the mysql client);
+-- schema_setup resolves the DELIMITER blocks, which pymysql can't execute as written.
+
+-- Per-research validation aggregates, kept current by triggers on validation_claims
+CREATE TABLE IF NOT EXISTS research_validation_summary (
+    research_metadata_id INT PRIMARY KEY,
+    total_claims INT NOT NULL DEFAULT 0,
+    supported_claims INT NOT NULL DEFAULT 0,
+    avg_confidence DECIMAL(7,6) DEFAULT NULL,
+    last_validation TIMESTAMP NULL DEFAULT NULL,
+    
+    FOREIGN KEY (research_metadata_id) 
+        REFERENCES research_metadata(id) 
+        ON DELETE CASCADE
+);
+
+DROP TRIGGER IF EXISTS validation_claims_summary_insert;
+DROP TRIGGER IF EXISTS validation_claims_summary_update;
+DROP TRIGGER IF EXISTS validation_claims_summary_delete;
+DROP PROCEDURE IF EXISTS RefreshValidationSummary;
+
+DELIMITER //
+
+CREATE PROCEDURE RefreshValidationSummary(IN target_id INT)
+BEGIN
+    DELETE FROM research_validation_summary WHERE research_metadata_id = target_id;
+    
+    INSERT INTO research_validation_summary (
+        research_metadata_id, total_claims, supported_claims, avg_confidence, last_validation
+    )
+    SELECT 
+        research_metadata_id,
+        COUNT(*),
+        COUNT(CASE WHEN supports_claim = TRUE THEN 1 END),
+        AVG(confidence_score),
+        MAX(validation_timestamp)
+    FROM validation_claims
+    WHERE research_metadata_id = target_id
+    GROUP BY research_metadata_id;
+END //
+
+CREATE TRIGGER validation_claims_summary_insert
+AFTER INSERT ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(NEW.research_metadata_id);
+END //
+
+CREATE TRIGGER validation_claims_summary_update
+AFTER UPDATE ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(NEW.research_metadata_id);
+    IF OLD.research_metadata_id <> NEW.research_metadata_id THEN
+        CALL RefreshValidationSummary(OLD.research_metadata_id);
+    END IF;
+END //
+
+CREATE TRIGGER validation_claims_summary_delete
+AFTER DELETE ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(OLD.research_metadata_id);
+END //
+
+DELIMITER ;
+
+-- Backfill existing claims
+REPLACE INTO research_validation_summary (
+    research_metadata_id, total_claims, supported_claims, avg_confidence, last_validation
+)
+SELECT 
+    research_metadata_id,
+    COUNT(*),
+    COUNT(CASE WHEN supports_claim = TRUE THEN 1 END),
+    AVG(confidence_score),
+    MAX(validation_timestamp)
+FROM validation_claims
+GROUP BY research_metadata_id;
+
+SELECT 'research_validation_summary migration completed' as status;
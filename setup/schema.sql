@@ -6,6 +6,7 @@ CREATE DATABASE IF NOT EXISTS etso_db CHARACTER SET utf8mb4 COLLATE utf8mb4_unic
 USE etso_db;
 
 -- Drop tables in correct order (respecting foreign keys)
+DROP TABLE IF EXISTS research_validation_summary;
 DROP TABLE IF EXISTS validation_claims;
 DROP TABLE IF EXISTS quarterly_reports;
 DROP TABLE IF EXISTS research_metadata;
@@ -83,6 +84,70 @@ CREATE TABLE validation_claims (
     INDEX idx_validation_time (validation_timestamp)
 );
 
+-- Per-research validation aggregates, kept current by triggers on validation_claims
+CREATE TABLE IF NOT EXISTS research_validation_summary (
+    research_metadata_id INT PRIMARY KEY,
+    total_claims INT NOT NULL DEFAULT 0,
+    supported_claims INT NOT NULL DEFAULT 0,
+    avg_confidence DECIMAL(7,6) DEFAULT NULL,
+    last_validation TIMESTAMP NULL DEFAULT NULL,
+    
+    FOREIGN KEY (research_metadata_id) 
+        REFERENCES research_metadata(id) 
+        ON DELETE CASCADE
+);
+
+DROP TRIGGER IF EXISTS validation_claims_summary_insert;
+DROP TRIGGER IF EXISTS validation_claims_summary_update;
+DROP TRIGGER IF EXISTS validation_claims_summary_delete;
+DROP PROCEDURE IF EXISTS RefreshValidationSummary;
+
+DELIMITER //
+
+CREATE PROCEDURE RefreshValidationSummary(IN target_id INT)
+BEGIN
+    DELETE FROM research_validation_summary WHERE research_metadata_id = target_id;
+    
+    INSERT INTO research_validation_summary (
+        research_metadata_id, total_claims, supported_claims, avg_confidence, last_validation
+    )
+    SELECT 
+        research_metadata_id,
+        COUNT(*),
+        COUNT(CASE WHEN supports_claim = TRUE THEN 1 END),
+        AVG(confidence_score),
+        MAX(validation_timestamp)
+    FROM validation_claims
+    WHERE research_metadata_id = target_id
+    GROUP BY research_metadata_id;
+END //
+
+CREATE TRIGGER validation_claims_summary_insert
+AFTER INSERT ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(NEW.research_metadata_id);
+END //
+
+CREATE TRIGGER validation_claims_summary_update
+AFTER UPDATE ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(NEW.research_metadata_id);
+    IF OLD.research_metadata_id <> NEW.research_metadata_id THEN
+        CALL RefreshValidationSummary(OLD.research_metadata_id);
+    END IF;
+END //
+
+CREATE TRIGGER validation_claims_summary_delete
+AFTER DELETE ON validation_claims
+FOR EACH ROW
+BEGIN
+    CALL RefreshValidationSummary(OLD.research_metadata_id);
+END //
+
+DELIMITER ;
+
 -- Quarterly report generation metadata
 CREATE TABLE quarterly_reports (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -46,38 +46,17 @@ class SchemaSetup:
     def execute_schema_file(self) -> bool:
         """Execute schema.sql file to create tables and procedures"""
         try:
-            # Read schema file
-            schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
-            
-            if not os.path.exists(schema_path):
-                logger.error(f"❌ Schema file not found: {schema_path}")
+            conn = self._execute_sql_file('schema.sql')
+            if conn is None:
                 return False
-            
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
-            
-            # Connect to database
-            conn = pymysql.connect(**self.etso_config)
             cursor = conn.cursor()
             
-            # Execute schema (split by semicolon and execute each statement)
-            statements = self._split_sql_statements(schema_sql)
-            
-            for i, statement in enumerate(statements):
-                if statement.strip():
-                    try:
-                        cursor.execute(statement)
-                        conn.commit()
-                    except Exception as e:
-                        if "already exists" not in str(e).lower():
-                            logger.warning(f"Statement {i+1} warning: {e}")
-            
             logger.info("✅ Schema executed successfully")
             
             # Verify tables were created
             cursor.execute("SHOW TABLES")
             tables = [row[0] for row in cursor.fetchall()]
-            expected_tables = ['research_metadata', 'validation_claims', 'quarterly_reports', 'system_config', 'data_insights', 'audit_log']
+            expected_tables = ['research_metadata', 'validation_claims', 'research_validation_summary', 'quarterly_reports', 'system_config', 'data_insights', 'audit_log']
             
             missing_tables = [t for t in expected_tables if t not in tables]
             if missing_tables:
@@ -93,7 +72,51 @@ class SchemaSetup:
             logger.error(f"❌ Failed to execute schema: {e}")
             return False
     
-    def _split_sql_statements(self, sql_content: str) -> list:
+    def apply_migration(self, filename: str) -> bool:
+        """Execute a migration file from this directory (e.g. add_validation_summary.sql)"""
+        try:
+            conn = self._execute_sql_file(filename)
+            if conn is None:
+                return False
+            conn.close()
+            logger.info(f"✅ Migration {filename} applied")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to apply migration {filename}: {e}")
+            return False
+    
+    def _execute_sql_file(self, filename: str) -> Optional[pymysql.Connection]:
+        """Execute every statement of a SQL file, returning the open connection
+        
+        Files may use mysql-client DELIMITER blocks for triggers and procedures;
+        _split_sql_statements resolves them, since pymysql sends one statement at a time.
+        """
+        path = os.path.join(os.path.dirname(__file__), filename)
+        
+        if not os.path.exists(path):
+            logger.error(f"❌ SQL file not found: {path}")
+            return None
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            sql_content = f.read()
+        
+        conn = pymysql.connect(**self.etso_config)
+        cursor = conn.cursor()
+        
+        for i, statement in enumerate(self._split_sql_statements(sql_content)):
+            if statement.strip():
+                try:
+                    cursor.execute(statement)
+                    conn.commit()
+                except Exception as e:
+                    if "already exists" not in str(e).lower():
+                        logger.warning(f"Statement {i+1} warning: {e}")
+        
+        return conn
+    
+    @staticmethod
+    def _split_sql_statements(sql_content: str) -> list:
         """Split SQL content into individual statements, handling DELIMITER changes"""
         statements = []
         current_statement = ""
@@ -214,7 +237,8 @@ class SchemaSetup:
         return True
 
 def main():
-    """Main setup function"""
+    """Main setup function; pass a migration file name to apply just that migration"""
+    import sys
     from config import config
     
     if not config.validate_config():
@@ -222,6 +246,8 @@ def main():
         return False
     
     setup = SchemaSetup(config)
+    if len(sys.argv) > 1:
+        return setup.apply_migration(sys.argv[1])
     return setup.full_setup()
 
 if __name__ == "__main__":
@@ -5,15 +5,127 @@ Generates SQL queries based on natural language validation descriptions
 """
 
 import re
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import date
+from pydantic import BaseModel, Field
+from pymysql.converters import escape_item
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Period parsing: quarter token and year token, each found in a single pass
+_QUARTER_RE = re.compile(r'q[1-4]')
+_YEAR_RE = re.compile(r'20\d{2}')
+_QUARTER_MONTHS = {'q1': (1, 4), 'q2': (4, 7), 'q3': (7, 10), 'q4': (10, 13)}
+
+_IMO_RE = re.compile(r'\d{7,}')
+
+# FROM clause building blocks shared by the query templates
+_FROM_CONTAINER_CALLS = """FROM escalas e
+        JOIN port_trace pt ON pt.imo = e.imo
+        JOIN v_fleet f ON e.imo = f.imo"""
+_JOIN_PORTS = "        LEFT JOIN ports p ON e.portname = p.portname"
+_JOIN_PORTS_P1_P2 = """        LEFT JOIN ports p1 ON e.portname = p1.portname
+        LEFT JOIN ports p2 ON e.next_port = p2.portname"""
+_JOIN_MRV = "        LEFT JOIN v_MRV m ON e.imo = m.imo"
+
+# Shipping companies matched against f.group (the shipping company field)
+_COMPANY_PATTERNS = {
+    'maersk': '%MAERSK%',
+    'msc': '%MSC%',
+    'cosco': '%COSCO%',
+    'cma': '%CMA%',
+    'hapag': '%HAPAG%',
+    'evergreen': '%EVERGREEN%',
+    'yang ming': '%YANG MING%',
+    'oocl': '%OOCL%',
+    'one': '%ONE%',
+    'zim': '%ZIM%'
+}
+# One pass over the filter for all company names; the lookahead keeps overlapping
+# matches so results are identical to testing each name as a substring
+_COMPANY_SCAN_RE = re.compile('(?=(' + '|'.join(map(re.escape, _COMPANY_PATTERNS)) + '))')
+
+# Major trade routes (%% escapes the LIKE wildcard for pymysql)
+_ROUTE_CONDITIONS = {
+    'asia-europe': "((p1.zone LIKE '%%Asia%%' AND p2.zone LIKE '%%Europe%%') OR (p1.zone LIKE '%%Europe%%' AND p2.zone LIKE '%%Asia%%'))",
+    'transpacific': "((p1.zone LIKE '%%Asia%%' AND p2.zone LIKE '%%America%%') OR (p1.zone LIKE '%%America%%' AND p2.zone LIKE '%%Asia%%'))",
+    'transatlantic': "((p1.zone LIKE '%%Europe%%' AND p2.zone LIKE '%%America%%') OR (p1.zone LIKE '%%America%%' AND p2.zone LIKE '%%Europe%%'))",
+    'intra-asia': "(p1.zone LIKE '%%Asia%%' AND p2.zone LIKE '%%Asia%%')",
+    'mediterranean': "(p1.zone LIKE '%%Mediterranean%%' OR p2.zone LIKE '%%Mediterranean%%')"
+}
+
+# Unambiguous keyword -> claim type rules that let simple logics skip the LLM
+_QUICK_RULES = [
+    (re.compile(r'\b(?:transit times?|delays?|lead times?)\b', re.IGNORECASE), 'transit_time'),
+    (re.compile(r'\b(?:co2|emissions?|fuel)\b', re.IGNORECASE), 'fuel_consumption'),
+    (re.compile(r'\b(?:routes?|trade lanes?|corridors?)\b', re.IGNORECASE), 'route_pattern'),
+    (re.compile(r'\b(?:port calls?|frequency|congestion)\b', re.IGNORECASE), 'port_frequency')
+]
+# Words (hyphenated compounds such as "asia-europe" stay whole)
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)*")
+# Words that never name a port, vessel, route or region; a rule-based parse only accepts logics
+# made of these, rule keywords, periods and one company, so no filter is silently dropped
+_GENERIC_WORDS = {
+    # Function words
+    'the', 'a', 'an', 'all', 'each', 'every', 'their', 'its', 'this', 'that', 'these', 'those', 'any',
+    'at', 'to', 'from', 'in', 'on', 'of', 'for', 'by', 'with', 'during', 'over', 'than', 'vs', 'versus',
+    'and', 'or', 'if', 'whether', 'per', 'across', 'since', 'between',
+    'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have', 'had', 'did', 'do', 'does', 'not',
+    # Actions
+    'check', 'verify', 'validate', 'analyze', 'analyse', 'examine', 'confirm', 'identify', 'measure',
+    'compare', 'compared', 'show', 'shows', 'find', 'track', 'assess',
+    # Comparisons and trends
+    'increase', 'increased', 'increases', 'increasing', 'decrease', 'decreased', 'decreases', 'decreasing',
+    'rise', 'rose', 'risen', 'rising', 'fall', 'fell', 'falling', 'drop', 'dropped', 'decline', 'declined',
+    'grew', 'growth', 'higher', 'lower', 'more', 'fewer', 'less', 'change', 'changes', 'changed',
+    'average', 'total', 'number', 'previous', 'last', 'next', 'same', 'period', 'quarter', 'year',
+    # Subjects
+    'container', 'containers', 'vessel', 'vessels', 'ship', 'ships', 'fleet', 'fleets',
+    'pattern', 'patterns', 'consumption', 'movement', 'movements', 'activity', 'schedules'
+}
+_PERIOD_TEXT_RE = re.compile(r'\b(?:q[1-4]\s*20\d{2}|20\d{2}\s*q[1-4]|q[1-4]|20\d{2})\b', re.IGNORECASE)
+
+EXAMPLE_VALIDATION_LOGICS = [
+    {
+        "logic": "Check if Maersk vessels increased port calls to Rotterdam in Q1 2025 compared to Q4 2024",
+        "type": "port_frequency"
+    },
+    {
+        "logic": "Analyze transit times for Asia-Europe trade routes to identify delays",
+        "type": "transit_time"
+    },
+    {
+        "logic": "Validate CO2 emissions increase for container vessels operating transpacific routes",
+        "type": "fuel_consumption"
+    },
+    {
+        "logic": "Examine route pattern changes for MSC vessels avoiding Suez Canal",
+        "type": "route_pattern"
+    },
+    {
+        "logic": "Verify increased vessel movements around Singapore hub during 2025",
+        "type": "vessel_movement"
+    },
+    {
+        "logic": "Check port congestion at Long Beach affecting container vessel schedules",
+        "type": "port_frequency"
+    }
+]
+
+# Words in a vessel filter that join or qualify names rather than name a vessel
+_VESSEL_CONNECTOR_WORDS = {'and', 'vessels', 'vessel', 'ships', 'ship', 'fleet', 'container', 'containers', 'imo'}
+
+# Keyword sets for picking few-shot examples that resemble the incoming logic
+_WORD_RE = re.compile(r'[a-z0-9]{3,}')
+_EXAMPLE_KEYWORDS = [set(_WORD_RE.findall(example['logic'].lower())) for example in EXAMPLE_VALIDATION_LOGICS]
+
+@dataclass(frozen=True)
 class QueryComponents:
     """Components needed to build a SQL query"""
     claim_type: str
@@ -24,6 +136,31 @@ class QueryComponents:
     metric: Optional[str] = None
     aggregation: Optional[str] = None
     comparison: Optional[str] = None
+    # Normalized at parse time; the builders fall back to the raw strings when unset
+    companies: Optional[Tuple[str, ...]] = None
+    trade_route: Optional[str] = None
+    date_range: Optional[Tuple[str, str]] = None
+
+class ParsedQueryComponents(BaseModel):
+    """Structured LLM output schema for validation logic parsing"""
+    claim_type: Literal[
+        'vessel_movement', 'transit_time', 'port_frequency', 'route_pattern', 'fuel_consumption'
+    ] = 'vessel_movement'
+    vessel_filter: Optional[str] = Field(None, description="Vessel names, IMO numbers or shipping companies")
+    route_filter: Optional[str] = Field(None, description="Trade routes, port pairs or geographic regions")
+    port_filter: Optional[str] = Field(None, description="Comma-separated ports")
+    period_filter: Optional[str] = Field(None, description="Quarter, year or date range")
+    metric: Optional[str] = Field(None, description="What to measure")
+    aggregation: Optional[str] = Field(None, description="COUNT, AVG, SUM, MIN or MAX")
+    comparison: Optional[str] = Field(None, description="Comparative terms, e.g. increase vs Q4 2024")
+    companies: Optional[List[Literal[
+        'maersk', 'msc', 'cosco', 'cma', 'hapag', 'evergreen', 'yang ming', 'oocl', 'one', 'zim'
+    ]]] = Field(None, description="Shipping companies named in vessel_filter that are among these")
+    trade_route: Optional[Literal[
+        'asia-europe', 'transpacific', 'transatlantic', 'intra-asia', 'mediterranean'
+    ]] = Field(None, description="Trade route named in route_filter, if it is one of these")
+    period_start: Optional[date] = Field(None, description="First day of period_filter")
+    period_end: Optional[date] = Field(None, description="Day after the last day of period_filter")
 
 @dataclass
 class SQLQueryResult:
@@ -33,12 +170,19 @@ class SQLQueryResult:
     components: QueryComponents
     confidence: float
     query_type: str
+    params: List[Any] = field(default_factory=list)
+    
+    def render(self) -> str:
+        """Inline the bind parameters for display and manual editing"""
+        return self.query % tuple(escape_item(p, 'utf8mb4') for p in self.params)
 
 class ValidationLogicParser:
     """Parses natural language validation logic into query components"""
     
     def __init__(self, llm: ChatOpenAI):
         self.llm = llm
+        # Schema-constrained output: no free-form JSON to parse or repair
+        self.structured_llm = llm.with_structured_output(ParsedQueryComponents, method='function_calling')
         self.parsing_prompt = self._create_parsing_prompt()
     
     def _create_parsing_prompt(self) -> ChatPromptTemplate:
@@ -67,15 +211,6 @@ WHERE f.fleet = 'containers'
 2. By Shipping Company: f.group LIKE '%MSC%' or '%Maersk%'
 3. By Vessel Name: f.name LIKE '%MSC LEILA%'
 
-## Analysis Patterns:
-- Route sequences: prev_port → portname → next_port
-- Distance: prev_leg, next_leg (nautical miles)
-- Time: start/end timestamps for port call duration
-- Geographic: JOIN ports for country/zone grouping
-- Emissions: LEFT JOIN v_MRV for CO2 analysis
-
-CRITICAL: You must respond with ONLY valid JSON - no explanations, no markdown, no additional text.
-
 Parse the validation logic and identify:
 1. claim_type: vessel_movement, transit_time, port_frequency, route_pattern, fuel_consumption
 2. vessel_filter: specific vessel names, IMO numbers, or shipping companies (Maersk, MSC, etc.)
@@ -84,89 +219,147 @@ Parse the validation logic and identify:
 5. period_filter: time periods (quarters, years, date ranges)
 6. metric: what to measure (delays, frequency, emissions, transit time, etc.)
 7. aggregation: how to aggregate (COUNT, AVG, SUM, MIN, MAX)
-8. comparison: comparative terms (increase, decrease, higher, lower, vs previous period)
+8. comparison: comparative terms (increase, decrease, higher, lower, vs previous period)"""),
+            ("user", """Similar validation logics:
+{examples}
 
-Response format:
-{
-    "claim_type": "vessel_movement",
-    "vessel_filter": "Maersk vessels",
-    "route_filter": "Asia-Europe trade lane", 
-    "port_filter": "Rotterdam",
-    "period_filter": "Q1 2025",
-    "metric": "port call frequency",
-    "aggregation": "COUNT",
-    "comparison": "increase vs Q4 2024"
-}"""),
-            ("user", "Parse this validation logic: {validation_logic}")
+Parse this validation logic: {validation_logic}""")
         ])
     
+    def _select_examples(self, validation_logic: str, limit: int = 3) -> str:
+        """Pick the few-shot examples sharing the most keywords with the logic"""
+        
+        keywords = set(_WORD_RE.findall(validation_logic.lower()))
+        ranked = sorted(
+            range(len(EXAMPLE_VALIDATION_LOGICS)),
+            key=lambda i: len(keywords & _EXAMPLE_KEYWORDS[i]),
+            reverse=True
+        )
+        
+        return "\n".join(
+            f"- {EXAMPLE_VALIDATION_LOGICS[i]['logic']} -> claim_type: {EXAMPLE_VALIDATION_LOGICS[i]['type']}"
+            for i in ranked[:limit]
+        )
+    
+    @staticmethod
+    def _quick_parse(validation_logic: str) -> Optional[QueryComponents]:
+        """Rule-based parse for unambiguous logics; None when the LLM is needed"""
+        
+        claim_types = {claim_type for pattern, claim_type in _QUICK_RULES if pattern.search(validation_logic)}
+        if len(claim_types) != 1:
+            return None
+        
+        # Rule keywords and periods are interpreted; every other word must be generic or a single
+        # known company. Anything else (a port, vessel, route or region, in any case) needs the LLM,
+        # since dropping it would silently broaden the query
+        logic = validation_logic.strip()
+        remainder = _PERIOD_TEXT_RE.sub(' ', logic)
+        for pattern, _ in _QUICK_RULES:
+            remainder = pattern.sub(' ', remainder)
+        
+        names = []
+        for word in _TOKEN_RE.findall(remainder):
+            if word[0].isupper() and word.lower() in _COMPANY_PATTERNS:
+                names.append(word)
+            elif word.lower() not in _GENERIC_WORDS:
+                return None
+        
+        companies = {name.lower() for name in names}
+        if len(companies) > 1:
+            return None
+        
+        company = companies.pop() if companies else None
+        period_match = _PERIOD_TEXT_RE.search(logic)
+        return QueryComponents(
+            claim_type=claim_types.pop(),
+            # The company as written in the logic
+            vessel_filter=names[0] if company else None,
+            period_filter=period_match.group() if period_match else None,
+            companies=(company,) if company else None
+        )
+    
     async def parse_validation_logic(self, validation_logic: str) -> QueryComponents:
         """Parse natural language validation logic into structured components"""
         
-        try:
-            response = await self.llm.ainvoke(
-                self.parsing_prompt.format_messages(validation_logic=validation_logic)
-            )
-            
-            # Parse JSON response
-            import json
-            components_dict = json.loads(response.content)
-            
-            return QueryComponents(
-                claim_type=components_dict.get('claim_type', 'vessel_movement'),
-                vessel_filter=components_dict.get('vessel_filter'),
-                route_filter=components_dict.get('route_filter'),
-                port_filter=components_dict.get('port_filter'),
-                period_filter=components_dict.get('period_filter'),
-                metric=components_dict.get('metric'),
-                aggregation=components_dict.get('aggregation'),
-                comparison=components_dict.get('comparison')
+        components = self._quick_parse(validation_logic)
+        if components:
+            logger.info(f"⚡ Rule-based parse: {components.claim_type}, skipping LLM")
+            return components
+        
+        # The system message is static so the provider can cache it as a prompt prefix;
+        # only the examples and the logic itself vary per call
+        parsed = await self.structured_llm.ainvoke(
+            self.parsing_prompt.format_messages(
+                examples=self._select_examples(validation_logic),
+                validation_logic=validation_logic
             )
-            
-        except Exception as e:
-            logger.error(f"Failed to parse validation logic: {e}")
-            # Return basic components
-            return QueryComponents(claim_type='vessel_movement')
+        )
+        
+        components = parsed.model_dump(exclude={'period_start', 'period_end'})
+        # Tuples keep the components hashable for SQLQueryBuilder's build cache
+        components['companies'] = tuple(parsed.companies) if parsed.companies else None
+        if parsed.period_start and parsed.period_end:
+            components['date_range'] = (parsed.period_start.isoformat(), parsed.period_end.isoformat())
+        
+        return QueryComponents(**components)
 
 class SQLQueryBuilder:
     """Builds SQL queries from parsed validation components"""
     
+    # Component filter -> (condition builder, normalized field), in WHERE clause order
+    _FILTER_BUILDERS = (
+        ('vessel_filter', '_build_vessel_condition', 'companies'),
+        ('port_filter', '_build_port_condition', None),
+        ('period_filter', '_build_period_condition', 'date_range'),
+        ('route_filter', '_build_route_condition', 'trade_route'),
+    )
+    
+    # Claim type -> template builder method name
+    _TEMPLATE_QUERIES = {
+        'vessel_movement': '_build_vessel_movement_query',
+        'transit_time': '_build_transit_time_query',
+        'port_frequency': '_build_port_frequency_query',
+        'route_pattern': '_build_route_pattern_query',
+        'fuel_consumption': '_build_fuel_consumption_query'
+    }
+    
     def __init__(self):
-        self.template_queries = {
-            'vessel_movement': self._build_vessel_movement_query,
-            'transit_time': self._build_transit_time_query,
-            'port_frequency': self._build_port_frequency_query,
-            'route_pattern': self._build_route_pattern_query,
-            'fuel_consumption': self._build_fuel_consumption_query
-        }
+        # Builds are deterministic in the components, so identical validations reuse them
+        self._cached_build = lru_cache(maxsize=2048)(self._build_from_template)
     
     def build_query(self, components: QueryComponents) -> SQLQueryResult:
         """Build SQL query from components"""
         
-        query_builder = self.template_queries.get(
-            components.claim_type, 
-            self._build_vessel_movement_query
-        )
-        
-        query, explanation, confidence = query_builder(components)
+        query, params, explanation, confidence = self._cached_build(components)
         
         return SQLQueryResult(
             query=query,
             explanation=explanation,
             components=components,
             confidence=confidence,
-            query_type=components.claim_type
+            query_type=components.claim_type,
+            params=list(params)
         )
     
-    def _build_vessel_movement_query(self, components: QueryComponents) -> Tuple[str, str, float]:
+    def _build_from_template(self, components: QueryComponents) -> Tuple[str, Tuple[Any, ...], str, float]:
+        """Dispatch to the template builder for the claim type"""
+        
+        query_builder = getattr(self, self._TEMPLATE_QUERIES.get(
+            components.claim_type,
+            '_build_vessel_movement_query'
+        ))
+        
+        query, params, explanation, confidence = query_builder(components)
+        return query, tuple(params), explanation, confidence
+    
+    def _build_vessel_movement_query(self, components: QueryComponents) -> Tuple[str, List[Any], str, float]:
         """Build vessel movement analysis query"""
         
         # Base query structure with required container vessel filtering
         select_clause = "SELECT e.imo, f.name as vessel_name, f.stype as vessel_type, f.group as shipping_company"
-        from_clause = """FROM escalas e 
-        JOIN port_trace pt ON pt.imo = e.imo
-        JOIN v_fleet f ON e.imo = f.imo"""
+        from_parts = [_FROM_CONTAINER_CALLS]
         where_conditions = ["f.fleet = 'containers'"]
+        params: List[Any] = []
         group_by = ""
         order_by = "ORDER BY e.start DESC"
         
@@ -174,41 +367,25 @@ class SQLQueryBuilder:
         if components.metric:
             if 'port' in components.metric.lower():
                 select_clause += ", e.portname, COUNT(*) as port_calls"
-                group_by = "GROUP BY e.imo, v.name, v.stype, e.portname"
+                group_by = "GROUP BY e.imo, f.name, f.stype, f.group, e.portname"
                 order_by = "ORDER BY port_calls DESC"
             elif 'route' in components.metric.lower():
                 select_clause += ", e.portname, e.next_port, COUNT(*) as route_frequency"
-                group_by = "GROUP BY e.imo, v.name, v.stype, e.portname, e.next_port"
+                group_by = "GROUP BY e.imo, f.name, f.stype, f.group, e.portname, e.next_port"
                 order_by = "ORDER BY route_frequency DESC"
             elif 'time' in components.metric.lower():
                 select_clause += ", e.start, e.end, TIMESTAMPDIFF(HOUR, e.start, e.end) as port_time_hours"
         
         # Add filters
-        if components.vessel_filter:
-            vessel_condition = self._build_vessel_condition(components.vessel_filter)
-            if vessel_condition:
-                where_conditions.append(vessel_condition)
-        
-        if components.port_filter:
-            port_condition = self._build_port_condition(components.port_filter)
-            if port_condition:
-                where_conditions.append(port_condition)
-        
-        if components.period_filter:
-            period_condition = self._build_period_condition(components.period_filter)
-            if period_condition:
-                where_conditions.append(period_condition)
-        
-        if components.route_filter:
-            route_condition = self._build_route_condition(components.route_filter)
-            if route_condition:
-                from_clause += " LEFT JOIN ports p_start ON e.portname = p_start.portname LEFT JOIN ports p_end ON e.next_port = p_end.portname"
-                where_conditions.append(route_condition)
+        filters = ('vessel_filter', 'port_filter', 'period_filter', 'route_filter')
+        if self._apply_common_filters(components, filters, where_conditions, params):
+            # Route conditions filter on origin/destination port zones
+            from_parts.append(_JOIN_PORTS_P1_P2)
         
         # Build final query
         where_clause = "WHERE " + " AND ".join(where_conditions)
         
-        query_parts = [select_clause, from_clause, where_clause]
+        query_parts = [select_clause, "\n".join(from_parts), where_clause]
         if group_by:
             query_parts.append(group_by)
         query_parts.append(order_by)
@@ -226,9 +403,9 @@ class SQLQueryBuilder:
         
         confidence = 0.8
         
-        return query, explanation, confidence
+        return query, params, explanation, confidence
     
-    def _build_transit_time_query(self, components: QueryComponents) -> Tuple[str, str, float]:
+    def _build_transit_time_query(self, components: QueryComponents) -> Tuple[str, List[Any], str, float]:
         """Build transit time analysis query"""
         
         select_clause = """SELECT 
@@ -241,9 +418,7 @@ class SQLQueryBuilder:
             AVG(e.prev_leg) as avg_distance_nm,
             COUNT(*) as journey_count"""
         
-        from_clause = """FROM escalas e 
-        JOIN port_trace pt ON pt.imo = e.imo 
-        JOIN v_fleet f ON e.imo = f.imo"""
+        from_parts = [_FROM_CONTAINER_CALLS]
         
         where_conditions = [
             "f.fleet = 'containers'",
@@ -252,31 +427,21 @@ class SQLQueryBuilder:
             "e.end IS NOT NULL",
             "TIMESTAMPDIFF(HOUR, e.start, e.end) BETWEEN 1 AND 720"  # 1 hour to 30 days
         ]
+        params: List[Any] = []
         
         # Add specific filters
-        if components.vessel_filter:
-            vessel_condition = self._build_vessel_condition(components.vessel_filter)
-            if vessel_condition:
-                where_conditions.append(vessel_condition)
-        
-        if components.route_filter:
-            route_condition = self._build_route_condition(components.route_filter)
-            if route_condition:
-                from_clause += " LEFT JOIN ports p_start ON e.portname = p_start.portname LEFT JOIN ports p_end ON e.next_port = p_end.portname"
-                where_conditions.append(route_condition)
-        
-        if components.period_filter:
-            period_condition = self._build_period_condition(components.period_filter)
-            if period_condition:
-                where_conditions.append(period_condition)
+        filters = ('vessel_filter', 'period_filter', 'route_filter')
+        if self._apply_common_filters(components, filters, where_conditions, params):
+            # Route conditions filter on origin/destination port zones
+            from_parts.append(_JOIN_PORTS_P1_P2)
         
         where_clause = "WHERE " + " AND ".join(where_conditions)
-        group_by = "GROUP BY e.imo, v.name, e.portname, e.next_port"
+        group_by = "GROUP BY e.imo, f.name, f.group, e.portname, e.next_port"
         having = "HAVING journey_count >= 3"
         order_by = "ORDER BY avg_port_time_hours DESC"
         
         query = "\n".join([
-            select_clause, from_clause, where_clause, 
+            select_clause, "\n".join(from_parts), where_clause, 
             group_by, having, order_by, "LIMIT 50"
         ])
         
@@ -286,9 +451,9 @@ class SQLQueryBuilder:
         if components.period_filter:
             explanation += f" during {components.period_filter}"
         
-        return query, explanation, 0.9
+        return query, params, explanation, 0.9
     
-    def _build_port_frequency_query(self, components: QueryComponents) -> Tuple[str, str, float]:
+    def _build_port_frequency_query(self, components: QueryComponents) -> Tuple[str, List[Any], str, float]:
         """Build port frequency analysis query"""
         
         select_clause = """SELECT 
@@ -299,35 +464,21 @@ class SQLQueryBuilder:
             COUNT(*) as total_calls,
             AVG(e.speed) as avg_speed"""
         
-        from_clause = """FROM escalas e 
-        JOIN port_trace pt ON pt.imo = e.imo
-        JOIN v_fleet f ON e.imo = f.imo
-        LEFT JOIN ports p ON e.portname = p.portname"""
+        from_parts = [_FROM_CONTAINER_CALLS, _JOIN_PORTS]
         
         where_conditions = ["f.fleet = 'containers'"]
+        params: List[Any] = []
         
-        if components.vessel_filter:
-            vessel_condition = self._build_vessel_condition(components.vessel_filter)
-            if vessel_condition:
-                where_conditions.append(vessel_condition)
-        
-        if components.port_filter:
-            port_condition = self._build_port_condition(components.port_filter)
-            if port_condition:
-                where_conditions.append(port_condition)
-        
-        if components.period_filter:
-            period_condition = self._build_period_condition(components.period_filter)
-            if period_condition:
-                where_conditions.append(period_condition)
+        filters = ('vessel_filter', 'port_filter', 'period_filter')
+        self._apply_common_filters(components, filters, where_conditions, params)
         
         where_clause = "WHERE " + " AND ".join(where_conditions)
-        group_by = "GROUP BY e.portname, p.country"
+        group_by = "GROUP BY e.portname, p.country, p.zone"
         having = "HAVING total_calls >= 5"
         order_by = "ORDER BY total_calls DESC"
         
         query = "\n".join([
-            select_clause, from_clause, where_clause,
+            select_clause, "\n".join(from_parts), where_clause,
             group_by, having, order_by, "LIMIT 30"
         ])
         
@@ -337,9 +488,9 @@ class SQLQueryBuilder:
         if components.period_filter:
             explanation += f" during {components.period_filter}"
         
-        return query, explanation, 0.85
+        return query, params, explanation, 0.85
     
-    def _build_route_pattern_query(self, components: QueryComponents) -> Tuple[str, str, float]:
+    def _build_route_pattern_query(self, components: QueryComponents) -> Tuple[str, List[Any], str, float]:
         """Build route pattern analysis query"""
         
         select_clause = """SELECT 
@@ -354,36 +505,21 @@ class SQLQueryBuilder:
             AVG(e.speed) as avg_speed,
             AVG(e.next_leg) as avg_distance_nm"""
         
-        from_clause = """FROM escalas e 
-        JOIN port_trace pt ON pt.imo = e.imo
-        JOIN v_fleet f ON e.imo = f.imo
-        LEFT JOIN ports p1 ON e.portname = p1.portname
-        LEFT JOIN ports p2 ON e.next_port = p2.portname"""
+        from_parts = [_FROM_CONTAINER_CALLS, _JOIN_PORTS_P1_P2]
         
         where_conditions = ["f.fleet = 'containers'", "e.next_port IS NOT NULL"]
+        params: List[Any] = []
         
-        if components.vessel_filter:
-            vessel_condition = self._build_vessel_condition(components.vessel_filter)
-            if vessel_condition:
-                where_conditions.append(vessel_condition)
-        
-        if components.route_filter:
-            route_condition = self._build_route_condition(components.route_filter)
-            if route_condition:
-                where_conditions.append(route_condition)
-        
-        if components.period_filter:
-            period_condition = self._build_period_condition(components.period_filter)
-            if period_condition:
-                where_conditions.append(period_condition)
+        filters = ('vessel_filter', 'period_filter', 'route_filter')
+        self._apply_common_filters(components, filters, where_conditions, params)
         
         where_clause = "WHERE " + " AND ".join(where_conditions)
-        group_by = "GROUP BY e.portname, e.next_port, p1.country, p2.country"
+        group_by = "GROUP BY e.portname, e.next_port, p1.country, p2.country, p1.zone, p2.zone"
         having = "HAVING route_frequency >= 3"
         order_by = "ORDER BY route_frequency DESC"
         
         query = "\n".join([
-            select_clause, from_clause, where_clause,
+            select_clause, "\n".join(from_parts), where_clause,
             group_by, having, order_by, "LIMIT 40"
         ])
         
@@ -393,9 +529,9 @@ class SQLQueryBuilder:
         if components.period_filter:
             explanation += f" during {components.period_filter}"
         
-        return query, explanation, 0.88
+        return query, params, explanation, 0.88
     
-    def _build_fuel_consumption_query(self, components: QueryComponents) -> Tuple[str, str, float]:
+    def _build_fuel_consumption_query(self, components: QueryComponents) -> Tuple[str, List[Any], str, float]:
         """Build fuel consumption analysis query"""
         
         select_clause = """SELECT 
@@ -409,34 +545,25 @@ class SQLQueryBuilder:
             AVG(e.speed) as avg_speed,
             AVG(e.next_leg) as avg_distance_nm"""
         
-        from_clause = """FROM escalas e 
-        JOIN port_trace pt ON pt.imo = e.imo
-        JOIN v_fleet f ON e.imo = f.imo
-        LEFT JOIN v_MRV m ON e.imo = m.imo"""
+        from_parts = [_FROM_CONTAINER_CALLS, _JOIN_MRV]
         
         where_conditions = [
             "f.fleet = 'containers'",
             "m.co2nm IS NOT NULL",
             "m.co2nm > 0"
         ]
+        params: List[Any] = []
         
-        if components.vessel_filter:
-            vessel_condition = self._build_vessel_condition(components.vessel_filter)
-            if vessel_condition:
-                where_conditions.append(vessel_condition)
-        
-        if components.period_filter:
-            period_condition = self._build_period_condition(components.period_filter)
-            if period_condition:
-                where_conditions.append(period_condition)
+        filters = ('vessel_filter', 'period_filter')
+        self._apply_common_filters(components, filters, where_conditions, params)
         
         where_clause = "WHERE " + " AND ".join(where_conditions)
-        group_by = "GROUP BY e.imo, v.name, v.stype, m.co2nm, m.foctd"
+        group_by = "GROUP BY e.imo, f.name, f.stype, f.group, m.co2nm, m.foctd"
         having = "HAVING voyage_count >= 2"
         order_by = "ORDER BY m.co2nm DESC"
         
         query = "\n".join([
-            select_clause, from_clause, where_clause,
+            select_clause, "\n".join(from_parts), where_clause,
             group_by, having, order_by, "LIMIT 50"
         ])
         
@@ -446,113 +573,117 @@ class SQLQueryBuilder:
         if components.period_filter:
             explanation += f" during {components.period_filter}"
         
-        return query, explanation, 0.92
+        return query, params, explanation, 0.92
     
-    def _build_vessel_condition(self, vessel_filter: str) -> str:
+    def _apply_common_filters(self, components: QueryComponents, filter_names: Tuple[str, ...],
+                              where_conditions: List[str], params: List[Any]) -> bool:
+        """Append the named component filters to the WHERE conditions; True if a route condition was added"""
+        
+        route_added = False
+        for filter_name, condition_builder, normalized_field in self._FILTER_BUILDERS:
+            value = getattr(components, filter_name)
+            normalized = getattr(components, normalized_field) if normalized_field else None
+            if filter_name not in filter_names or not (value or normalized):
+                continue
+            
+            if normalized_field:
+                condition, condition_params = getattr(self, condition_builder)(value, normalized)
+            else:
+                condition, condition_params = getattr(self, condition_builder)(value)
+            if condition:
+                where_conditions.append(condition)
+                params.extend(condition_params)
+                route_added = route_added or filter_name == 'route_filter'
+        
+        return route_added
+    
+    def _build_vessel_condition(self, vessel_filter: Optional[str],
+                                companies: Optional[Tuple[str, ...]] = None) -> Tuple[str, List[Any]]:
         """Build vessel filter condition using proper schema patterns"""
+        vessel_filter = vessel_filter or ''
         vessel_lower = vessel_filter.lower()
         
         conditions = []
+        params: List[Any] = []
         
         # Check for IMO numbers (most reliable - all digits)
         if vessel_filter.isdigit() and len(vessel_filter) >= 7:
-            conditions.append(f"e.imo = {vessel_filter}")
+            conditions.append("e.imo = %s")
+            params.append(int(vessel_filter))
         elif any(char.isdigit() for char in vessel_filter) and len([c for c in vessel_filter if c.isdigit()]) >= 7:
             # Extract IMO if present
-            import re
-            imo_match = re.search(r'\d{7,}', vessel_filter)
+            imo_match = _IMO_RE.search(vessel_filter)
             if imo_match:
-                conditions.append(f"e.imo = {imo_match.group()}")
-        
-        # Check for shipping companies (use f.group - shipping company field)
-        companies = {
-            'maersk': 'f.group LIKE "%MAERSK%"',
-            'msc': 'f.group LIKE "%MSC%"', 
-            'cosco': 'f.group LIKE "%COSCO%"',
-            'cma': 'f.group LIKE "%CMA%"',
-            'hapag': 'f.group LIKE "%HAPAG%"',
-            'evergreen': 'f.group LIKE "%EVERGREEN%"',
-            'yang ming': 'f.group LIKE "%YANG MING%"',
-            'oocl': 'f.group LIKE "%OOCL%"',
-            'one': 'f.group LIKE "%ONE%"',
-            'zim': 'f.group LIKE "%ZIM%"'
-        }
-        
-        for company, condition in companies.items():
-            if company in vessel_lower:
-                conditions.append(condition)
-        
-        # Check for specific vessel names (less reliable)
-        if not conditions:
-            conditions.append(f'f.name LIKE "%{vessel_filter}%"')
-        
-        return "(" + " OR ".join(conditions) + ")"
+                conditions.append("e.imo = %s")
+                params.append(int(imo_match.group()))
+        
+        # Check for shipping companies (use f.group - shipping company field): the ones the
+        # parser normalized plus any named in the filter text, e.g. both of "Maersk and MSC"
+        named = [m.group(1) for m in _COMPANY_SCAN_RE.finditer(vessel_lower)]
+        for company_name in dict.fromkeys(list(companies or ()) + named):
+            conditions.append("f.group LIKE %s")
+            params.append(_COMPANY_PATTERNS[company_name])
+        
+        # Check for specific vessel names (less reliable), also alongside a company as in "MSC LEILA"
+        leftover = _IMO_RE.sub(' ', vessel_lower)
+        for company_name in named:
+            leftover = leftover.replace(company_name, ' ')
+        if not conditions or set(_WORD_RE.findall(leftover)) - _VESSEL_CONNECTOR_WORDS:
+            conditions.append("f.name LIKE %s")
+            params.append(f"%{vessel_filter}%")
+        
+        return "(" + " OR ".join(conditions) + ")", params
     
-    def _build_port_condition(self, port_filter: str) -> str:
+    def _build_port_condition(self, port_filter: str) -> Tuple[str, List[Any]]:
         """Build port filter condition"""
+        # Single port (the common case): no split or OR-group needed
+        if ',' not in port_filter:
+            return "e.portname LIKE %s", [f"%{port_filter.strip()}%"]
+        
         # Handle multiple ports
         ports = [p.strip() for p in port_filter.split(',')]
-        port_conditions = [f"e.portname LIKE '%{port}%'" for port in ports]
-        return "(" + " OR ".join(port_conditions) + ")"
+        port_conditions = ["e.portname LIKE %s"] * len(ports)
+        return "(" + " OR ".join(port_conditions) + ")", [f"%{port}%" for port in ports]
     
-    def _build_route_condition(self, route_filter: str) -> str:
+    def _build_route_condition(self, route_filter: Optional[str],
+                               trade_route: Optional[str] = None) -> Tuple[str, List[Any]]:
         """Build route filter condition"""
-        route_lower = route_filter.lower()
+        if trade_route:
+            return _ROUTE_CONDITIONS[trade_route], []
         
-        # Define major trade routes
-        route_conditions = {
-            'asia-europe': "(p1.zone LIKE '%Asia%' AND p2.zone LIKE '%Europe%') OR (p1.zone LIKE '%Europe%' AND p2.zone LIKE '%Asia%')",
-            'transpacific': "(p1.zone LIKE '%Asia%' AND p2.zone LIKE '%America%') OR (p1.zone LIKE '%America%' AND p2.zone LIKE '%Asia%')",
-            'transatlantic': "(p1.zone LIKE '%Europe%' AND p2.zone LIKE '%America%') OR (p1.zone LIKE '%America%' AND p2.zone LIKE '%Europe%')",
-            'intra-asia': "p1.zone LIKE '%Asia%' AND p2.zone LIKE '%Asia%'",
-            'mediterranean': "p1.zone LIKE '%Mediterranean%' OR p2.zone LIKE '%Mediterranean%'"
-        }
+        route_lower = route_filter.lower()
         
-        for route_name, condition in route_conditions.items():
+        for route_name, condition in _ROUTE_CONDITIONS.items():
             if route_name.replace('-', '').replace(' ', '') in route_lower.replace('-', '').replace(' ', ''):
-                return condition
+                return condition, []
         
         # Default: treat as region filter
-        return f"(p1.zone LIKE '%{route_filter}%' OR p2.zone LIKE '%{route_filter}%')"
+        return "(p1.zone LIKE %s OR p2.zone LIKE %s)", [f"%{route_filter}%", f"%{route_filter}%"]
     
-    def _build_period_condition(self, period_filter: str) -> str:
+    def _build_period_condition(self, period_filter: Optional[str],
+                                date_range: Optional[Tuple[str, str]] = None) -> Tuple[str, List[Any]]:
         """Build period filter condition"""
+        if date_range:
+            return "e.start >= %s AND e.start < %s", list(date_range)
+        
         period_lower = period_filter.lower()
         
-        # Handle quarters
-        if 'q1' in period_lower:
-            year = '2025'
-            if any(y in period_lower for y in ['2024', '2025', '2026', '2027']):
-                year = next(y for y in ['2024', '2025', '2026', '2027'] if y in period_lower)
-            return f"e.start >= '{year}-01-01' AND e.start < '{year}-04-01'"
-        elif 'q2' in period_lower:
-            year = '2025'
-            if any(y in period_lower for y in ['2024', '2025', '2026', '2027']):
-                year = next(y for y in ['2024', '2025', '2026', '2027'] if y in period_lower)
-            return f"e.start >= '{year}-04-01' AND e.start < '{year}-07-01'"
-        elif 'q3' in period_lower:
-            year = '2025'
-            if any(y in period_lower for y in ['2024', '2025', '2026', '2027']):
-                year = next(y for y in ['2024', '2025', '2026', '2027'] if y in period_lower)
-            return f"e.start >= '{year}-07-01' AND e.start < '{year}-10-01'"
-        elif 'q4' in period_lower:
-            year = '2025'
-            if any(y in period_lower for y in ['2024', '2025', '2026', '2027']):
-                year = next(y for y in ['2024', '2025', '2026', '2027'] if y in period_lower)
-            return f"e.start >= '{year}-10-01' AND e.start < '{int(year)+1}-01-01'"
-        
-        # Handle years
-        if '2024' in period_lower:
-            return "e.start >= '2024-01-01' AND e.start < '2025-01-01'"
-        elif '2025' in period_lower:
-            return "e.start >= '2025-01-01' AND e.start < '2026-01-01'"
-        elif '2026' in period_lower:
-            return "e.start >= '2026-01-01' AND e.start < '2027-01-01'"
-        elif '2027' in period_lower:
-            return "e.start >= '2027-01-01' AND e.start < '2028-01-01'"
-        
-        # Default: last year
-        return "e.start >= DATE_SUB(NOW(), INTERVAL 1 YEAR)"
+        quarter_match = _QUARTER_RE.search(period_lower)
+        year_match = _YEAR_RE.search(period_lower)
+        
+        if not quarter_match and not year_match:
+            # Default: last year
+            return "e.start >= DATE_SUB(NOW(), INTERVAL 1 YEAR)", []
+        
+        year = int(year_match.group()) if year_match else 2025
+        if quarter_match:
+            start_month, end_month = _QUARTER_MONTHS[quarter_match.group()]
+        else:
+            start_month, end_month = 1, 13
+        
+        period_start = f"{year}-{start_month:02d}-01"
+        period_end = f"{year + 1}-01-01" if end_month == 13 else f"{year}-{end_month:02d}-01"
+        return "e.start >= %s AND e.start < %s", [period_start, period_end]
 
 class ValidationSQLBuilder:
     """Main class for building SQL from validation logic"""
@@ -588,32 +719,31 @@ class ValidationSQLBuilder:
             
             return fallback_result
     
+    async def build_many(self, validation_logics: List[str],
+                         concurrency: int = 8) -> AsyncIterator[Tuple[int, SQLQueryResult]]:
+        """Build SQL for several validation logics, yielding (index, result) as each completes
+        
+        Up to `concurrency` LLM parses are in flight at once, so query building for
+        finished items overlaps with the remaining LLM round-trips.
+        """
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def build_one(index: int, validation_logic: str) -> Tuple[int, SQLQueryResult]:
+            async with semaphore:
+                return index, await self.build_sql_from_validation_logic(validation_logic)
+        
+        # Explicit tasks, so parses still running when the consumer stops early can be cancelled
+        tasks = [asyncio.create_task(build_one(i, logic)) for i, logic in enumerate(validation_logics)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def get_example_validation_logics(self) -> List[Dict[str, str]]:
         """Get example validation logics for testing"""
         
-        return [
-            {
-                "logic": "Check if Maersk vessels increased port calls to Rotterdam in Q1 2025 compared to Q4 2024",
-                "type": "port_frequency"
-            },
-            {
-                "logic": "Analyze transit times for Asia-Europe trade routes to identify delays",
-                "type": "transit_time"
-            },
-            {
-                "logic": "Validate CO2 emissions increase for container vessels operating transpacific routes",
-                "type": "fuel_consumption"
-            },
-            {
-                "logic": "Examine route pattern changes for MSC vessels avoiding Suez Canal",
-                "type": "route_pattern"
-            },
-            {
-                "logic": "Verify increased vessel movements around Singapore hub during 2025",
-                "type": "vessel_movement"
-            },
-            {
-                "logic": "Check port congestion at Long Beach affecting container vessel schedules",
-                "type": "port_frequency"
-            }
-        ]
\ No newline at end of file
+        return [dict(example) for example in EXAMPLE_VALIDATION_LOGICS]
\ No newline at end of file
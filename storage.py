@@ -3,12 +3,28 @@ OBSERVATORIO ETS - Research Storage Manager
 Manages research findings between ChromaDB and ETSO database
 """
 
+import os
+import copy
+import asyncio
 import uuid
 import json
 import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field
+
+import numpy as np
+import pymysql
+try:
+    import orjson
+except ImportError:  # orjson arrives transitively with chromadb/langsmith; plain json still works
+    orjson = None
 
 import chromadb
 from chromadb.config import Settings
@@ -20,7 +36,24 @@ from config import SystemConfig
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Output dimension of OpenAI embedding models, so startup can check a collection without an API call
+_EMBEDDING_DIMENSIONS = {
+    'text-embedding-ada-002': 1536,
+    'text-embedding-3-small': 1536,
+    'text-embedding-3-large': 3072
+}
+
+def _dumps(obj: Any) -> str:
+    """Serialize a metadata field to a JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+def _loads(data: str) -> Any:
+    """Parse a JSON metadata field"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+@dataclass(slots=True)
 class ResearchFinding:
     """Structure for research finding data"""
     quarter: str
@@ -37,6 +70,138 @@ class ResearchFinding:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+@dataclass
+class BatchBuffer:
+    """Pending ChromaDB writes, flushed together as one collection.add()"""
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def append(self, chroma_id: str, document: str, metadata: Dict[str, Any]):
+        self.ids.append(chroma_id)
+        self.documents.append(document)
+        self.metadatas.append(metadata)
+
+class ShadowStore:
+    """Local SQLite copy of ChromaDB documents and metadata, keyed by chroma_id"""
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS findings (id TEXT PRIMARY KEY, document TEXT, metadata TEXT NOT NULL)"
+            )
+    
+    def put_many(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]):
+        rows = [(chroma_id, document, _dumps(metadata)) for chroma_id, document, metadata in zip(ids, documents, metadatas)]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO findings VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Failed to write ChromaDB shadow copy: {e}")
+    
+    def get(self, chroma_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT document, metadata FROM findings WHERE id = ?", (chroma_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Failed to read ChromaDB shadow copy: {e}")
+            return None
+        return (row[0], _loads(row[1])) if row else None
+    
+    def update_metadata(self, chroma_id: str, metadata: Dict[str, Any]):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("UPDATE findings SET metadata = ? WHERE id = ?", (_dumps(metadata), chroma_id))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Failed to update ChromaDB shadow copy: {e}")
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SemanticResultCache:
+    """Enriched search results reused when a new topic embedding is close to a cached one"""
+    
+    def __init__(self, threshold: float = 0.95, max_rows: int = 1024):
+        self.threshold = threshold
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        # (quarter, limit) -> normalized float32 embeddings, payloads and last-access times.
+        # 'matrix' is a contiguous (capacity, d) buffer of which the first 'size' rows are used.
+        self._entries: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.array(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+    
+    def lookup(self, key: Tuple[str, int], vector: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                similarities = entry['matrix'][:entry['size']] @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry['last_access'][best] = time.monotonic()
+                    self.hits += 1
+                    return list(entry['payloads'][best])
+            self.misses += 1
+            return None
+    
+    def store(self, key: Tuple[str, int], vector: np.ndarray, payload: List[Dict[str, Any]]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    'matrix': np.empty((min(16, self.max_rows), vector.shape[0]), dtype=np.float32),
+                    'size': 0,
+                    'payloads': [],
+                    'last_access': np.empty(min(16, self.max_rows))
+                }
+            
+            size = entry['size']
+            if size >= self.max_rows:
+                # Evict the least recently used row in place
+                row = int(np.argmin(entry['last_access'][:size]))
+                entry['payloads'][row] = list(payload)
+            else:
+                if size == len(entry['matrix']):
+                    # Grow geometrically so inserts don't copy the whole matrix each time
+                    capacity = min(2 * size, self.max_rows)
+                    matrix = np.empty((capacity, entry['matrix'].shape[1]), dtype=np.float32)
+                    matrix[:size] = entry['matrix']
+                    last_access = np.empty(capacity)
+                    last_access[:size] = entry['last_access']
+                    entry['matrix'], entry['last_access'] = matrix, last_access
+                row = size
+                entry['size'] = size + 1
+                entry['payloads'].append(list(payload))
+            
+            entry['matrix'][row] = vector
+            entry['last_access'][row] = time.monotonic()
+    
+    def invalidate(self, quarter: Optional[str] = None):
+        """Drop cached results for a quarter, or everything when no quarter is given"""
+        with self._lock:
+            if quarter is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == quarter]:
+                    del self._entries[key]
+
 class ChromaDBManager:
     """Manages ChromaDB operations for research storage and retrieval"""
     
@@ -45,6 +210,24 @@ class ChromaDBManager:
         self.chroma_config = config.chroma.CHROMA_CONFIG
         self.embeddings = OpenAIEmbeddings()
         
+        # Write buffer for queue_research_finding, drained by size or by the background flusher
+        self._buffer = BatchBuffer()
+        self._buffer_lock = threading.Lock()
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        
+        # Repeated searches reuse the query embedding instead of another OpenAI call;
+        # hits/misses are available via self._query_embedding.cache_info()
+        self._query_embedding = lru_cache(maxsize=2048)(self._embed_query)
+        
+        # Local copy of every document/metadata written, so reads and confidence
+        # updates don't need a ChromaDB fetch
+        self._shadow = ShadowStore(self.chroma_config['shadow_path'])
+        
+        # Recently retrieved findings: chroma_id -> (expiry, finding), least recently used first
+        self._finding_cache: 'OrderedDict[str, Tuple[float, ResearchFinding]]' = OrderedDict()
+        self._finding_cache_lock = threading.Lock()
+        
         # Initialize ChromaDB client
         self._init_chroma_client()
         
@@ -68,42 +251,125 @@ class ChromaDBManager:
                 )
                 logger.info(f"💾 Using local ChromaDB at {self.chroma_config['persist_directory']}")
             
-            # Get or create collection
+            # Get or create collection; embeddings are computed by self.embeddings in bulk,
+            # so ChromaDB is not given an embedding function of its own
             self.collection = self.client.get_or_create_collection(
-                name=self.chroma_config['collection_name']
+                name=self.chroma_config['collection_name'],
+                embedding_function=None,
+                metadata=self._collection_metadata()
             )
+            self._migrate_legacy_embeddings()
             
         except Exception as e:
             logger.error(f"❌ ChromaDB initialization failed: {e}")
             raise
     
-    def store_research_finding(self, finding: ResearchFinding) -> str:
+    def _collection_metadata(self) -> Dict[str, Any]:
+        return {
+            'hnsw:construction_ef': self.chroma_config['hnsw_construction_ef'],
+            'hnsw:M': self.chroma_config['hnsw_m'],
+            # Persist the index less often during bulk ingest; writes stay durable in the WAL
+            'hnsw:sync_threshold': self.chroma_config['hnsw_sync_threshold'],
+            # Which model wrote the embeddings, checked at startup by _migrate_legacy_embeddings
+            'embedding_model': self.embeddings.model
+        }
+    
+    def _embedding_dimension(self) -> int:
+        dimension = _EMBEDDING_DIMENSIONS.get(self.embeddings.model)
+        if dimension is None:
+            # Unknown model: one uncached API call, only until the model is recorded on the collection
+            dimension = len(self.embeddings.embed_query('embedding dimension probe'))
+        return dimension
+    
+    def _migrate_legacy_embeddings(self):
+        """Re-embed a collection written with ChromaDB's default embedding model
+        
+        Every document and its metadata are copied, with OpenAI embeddings, into a new collection
+        that then takes over the configured name. The old collection is kept under a _legacy
+        name instead of being deleted, since ChromaDB holds the only copy of the research content.
+        """
+        # Collections created or migrated by this code record their embedding model
+        collection_metadata = self.collection.metadata or {}
+        if collection_metadata.get('embedding_model') == self.embeddings.model:
+            return
+        
+        sample = self.collection.get(limit=1, include=['embeddings'])
+        legacy_dimension = len(sample['embeddings'][0]) if sample['ids'] else None
+        dimension = self._embedding_dimension() if sample['ids'] else None
+        if legacy_dimension == dimension:
+            self.collection.modify(metadata={**collection_metadata, 'embedding_model': self.embeddings.model})
+            return
+        
+        name = self.chroma_config['collection_name']
+        logger.warning(f"⚠️  Collection {name} has {legacy_dimension}-d embeddings, re-embedding to {dimension}-d")
+        
+        # A migration interrupted earlier resumes into the same target collection
+        target = self.client.get_or_create_collection(
+            name=f"{name}_migrating",
+            embedding_function=None,
+            metadata=self._collection_metadata()
+        )
+        
+        copied = 0
+        offset = 0
+        page_size = self.chroma_config['batch_size']
+        while True:
+            page = self.collection.get(include=['documents', 'metadatas'], limit=page_size, offset=offset)
+            if not page['ids']:
+                break
+            offset += len(page['ids'])
+            
+            already_copied = set(target.get(ids=page['ids'], include=[])['ids'])
+            pending = [i for i, chroma_id in enumerate(page['ids']) if chroma_id not in already_copied]
+            if not pending:
+                continue
+            
+            documents = [page['documents'][i] or '' for i in pending]
+            target.add(
+                ids=[page['ids'][i] for i in pending],
+                documents=documents,
+                embeddings=self.embeddings.embed_documents(documents),
+                metadatas=[page['metadatas'][i] for i in pending]
+            )
+            copied += len(pending)
+        
+        legacy_name = f"{name}_legacy_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.collection.modify(name=legacy_name)
+        target.modify(name=name)
+        self.collection = target
+        logger.info(f"✅ Re-embedded {copied} findings into {name}; previous collection kept as {legacy_name}")
+    
+    def _build_metadata(self, finding: ResearchFinding) -> Dict[str, Any]:
+        """Prepare the ChromaDB metadata for a research finding"""
+        return {
+            'quarter': finding.quarter,
+            'theme_type': finding.theme_type,
+            'user_guidance': finding.user_guidance[:500],  # Truncate for metadata
+            'enhanced_query': finding.enhanced_query[:500],
+            'validation_targets': _dumps(finding.validation_targets),
+            'expected_outputs': _dumps(finding.expected_outputs),
+            'research_scope': _dumps(finding.research_scope),
+            'confidence': finding.confidence,
+            'status': finding.status,
+            'timestamp': datetime.now().isoformat(),
+            'content_length': len(finding.research_content)
+        }
+    
+    def store_research_finding(self, finding: ResearchFinding, chroma_id: Optional[str] = None) -> str:
         """Store research finding in ChromaDB with vector embedding"""
         
-        chroma_id = str(uuid.uuid4())
+        chroma_id = chroma_id or str(uuid.uuid4())
         
         try:
-            # Prepare metadata
-            metadata = {
-                'quarter': finding.quarter,
-                'theme_type': finding.theme_type,
-                'user_guidance': finding.user_guidance[:500],  # Truncate for metadata
-                'enhanced_query': finding.enhanced_query[:500],
-                'validation_targets': json.dumps(finding.validation_targets),
-                'expected_outputs': json.dumps(finding.expected_outputs),
-                'research_scope': json.dumps(finding.research_scope),
-                'confidence': finding.confidence,
-                'status': finding.status,
-                'timestamp': datetime.now().isoformat(),
-                'content_length': len(finding.research_content)
-            }
-            
             # Store in ChromaDB
+            metadata = self._build_metadata(finding)
             self.collection.add(
                 documents=[finding.research_content],
+                embeddings=self.embeddings.embed_documents([finding.research_content]),
                 metadatas=[metadata],
                 ids=[chroma_id]
             )
+            self._shadow.put_many([chroma_id], [finding.research_content], [metadata])
             
             logger.info(f"✅ Research finding stored in ChromaDB: {chroma_id}")
             return chroma_id
@@ -112,21 +378,180 @@ class ChromaDBManager:
             logger.error(f"❌ Failed to store in ChromaDB: {e}")
             raise
     
+    def store_research_findings_bulk(self, findings: List[ResearchFinding]) -> List[str]:
+        """Store several research findings with a single ChromaDB add"""
+        
+        batch = BatchBuffer()
+        for finding in findings:
+            batch.append(str(uuid.uuid4()), finding.research_content, self._build_metadata(finding))
+        
+        return self._add_batch(batch)
+    
+    def queue_research_finding(self, finding: ResearchFinding) -> str:
+        """Buffer a research finding for a batched add and return its ChromaDB ID immediately
+        
+        The buffer is flushed once it holds `batch_size` findings, every `flush_interval`
+        seconds by a background thread, and on flush()/close().
+        """
+        
+        chroma_id = str(uuid.uuid4())
+        
+        with self._buffer_lock:
+            self._buffer.append(chroma_id, finding.research_content, self._build_metadata(finding))
+            buffer_full = len(self._buffer) >= self.chroma_config['batch_size']
+        
+        if buffer_full:
+            self.flush()
+        else:
+            self._ensure_flusher()
+        
+        return chroma_id
+    
+    def flush(self) -> List[str]:
+        """Write all buffered findings to ChromaDB"""
+        
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, BatchBuffer()
+        
+        return self._add_batch(batch) if batch else []
+    
+    def close(self):
+        """Stop the background flusher and write any buffered findings"""
+        
+        self._stop_flusher.set()
+        if self._flusher:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        self._shadow.close()
+    
+    def __enter__(self) -> 'ChromaDBManager':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _ensure_flusher(self):
+        """Start the interval flusher thread on first use"""
+        
+        if self._flusher is None:
+            self._stop_flusher.clear()
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+    
+    def _flush_periodically(self):
+        while not self._stop_flusher.wait(self.chroma_config['flush_interval']):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Background ChromaDB flush failed: {e}")
+    
+    def _add_batch(self, batch: BatchBuffer) -> List[str]:
+        """Add a batch in one call, falling back to per-finding adds if it fails"""
+        
+        embeddings = None
+        try:
+            # One batched embeddings request for the whole batch
+            embeddings = self.embeddings.embed_documents(batch.documents)
+            if self.chroma_config['use_server'] and len(batch) > self.chroma_config['async_chunk_size']:
+                self._run_on_own_loop(self._add_concurrently(batch, embeddings))
+            else:
+                self.collection.add(
+                    documents=batch.documents,
+                    embeddings=embeddings,
+                    metadatas=batch.metadatas,
+                    ids=batch.ids
+                )
+            self._shadow.put_many(batch.ids, batch.documents, batch.metadatas)
+            logger.info(f"✅ Stored {len(batch)} research findings in ChromaDB")
+            return list(batch.ids)
+            
+        except Exception as e:
+            logger.warning(f"⚠️  Batch add of {len(batch)} findings failed ({e}), retrying one by one")
+        
+        # Concurrent sub-batch adds may have partly landed before the failure
+        try:
+            existing = set(self.collection.get(ids=list(batch.ids), include=[])['ids'])
+        except Exception as e:
+            logger.warning(f"⚠️  Could not check which findings were already stored: {e}")
+            existing = set()
+        
+        stored_ids = []
+        for i, (chroma_id, document, metadata) in enumerate(zip(batch.ids, batch.documents, batch.metadatas)):
+            try:
+                if chroma_id in existing:
+                    self._shadow.put_many([chroma_id], [document], [metadata])
+                    stored_ids.append(chroma_id)
+                    continue
+                embedding = embeddings[i] if embeddings else self.embeddings.embed_documents([document])[0]
+                self.collection.add(documents=[document], embeddings=[embedding], metadatas=[metadata], ids=[chroma_id])
+                self._shadow.put_many([chroma_id], [document], [metadata])
+                stored_ids.append(chroma_id)
+            except Exception as e:
+                logger.error(f"❌ Failed to store in ChromaDB: {chroma_id}: {e}")
+        
+        return stored_ids
+    
+    @staticmethod
+    def _run_on_own_loop(coroutine):
+        """Run a coroutine on a private event loop in a worker thread
+        
+        Flushes are called from sync code that may itself run inside main.py's event loop,
+        where asyncio.run() would raise.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def _add_concurrently(self, batch: BatchBuffer, embeddings: List[List[float]]):
+        """Send a large batch to the ChromaDB server as overlapping sub-batch adds"""
+        
+        client = await chromadb.AsyncHttpClient(
+            host=self.chroma_config['host'],
+            port=self.chroma_config['port']
+        )
+        collection = await client.get_collection(name=self.chroma_config['collection_name'])
+        semaphore = asyncio.Semaphore(self.chroma_config['max_concurrent_writes'])
+        chunk_size = self.chroma_config['async_chunk_size']
+        
+        async def add_chunk(start: int):
+            end = start + chunk_size
+            async with semaphore:
+                await collection.add(
+                    documents=batch.documents[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=batch.metadatas[start:end],
+                    ids=batch.ids[start:end]
+                )
+        
+        await asyncio.gather(*(add_chunk(start) for start in range(0, len(batch), chunk_size)))
+    
     def retrieve_research_finding(self, chroma_id: str) -> Optional[ResearchFinding]:
         """Retrieve research finding from ChromaDB by ID"""
         
+        with self._finding_cache_lock:
+            cached = self._finding_cache.get(chroma_id)
+            if cached and cached[0] > time.monotonic():
+                self._finding_cache.move_to_end(chroma_id)
+                # Callers update confidence/status on the returned object, so hand out a copy
+                return copy.deepcopy(cached[1])
+        
         try:
-            result = self.collection.get(
-                ids=[chroma_id],
-                include=['documents', 'metadatas']
-            )
-            
-            if not result['documents']:
-                logger.warning(f"⚠️  Research finding not found: {chroma_id}")
-                return None
-            
-            document = result['documents'][0]
-            metadata = result['metadatas'][0]
+            shadow = self._shadow.get(chroma_id)
+            if shadow:
+                document, metadata = shadow
+            else:
+                result = self.collection.get(
+                    ids=[chroma_id],
+                    include=['documents', 'metadatas']
+                )
+                
+                if not result['documents']:
+                    logger.warning(f"⚠️  Research finding not found: {chroma_id}")
+                    return None
+                
+                document = result['documents'][0]
+                metadata = result['metadatas'][0]
+                self._shadow.put_many([chroma_id], [document], [metadata])
             
             # Reconstruct ResearchFinding
             finding = ResearchFinding(
@@ -135,22 +560,41 @@ class ChromaDBManager:
                 user_guidance=metadata['user_guidance'],
                 enhanced_query=metadata['enhanced_query'],
                 research_content=document,
-                validation_targets=json.loads(metadata.get('validation_targets', '[]')),
-                expected_outputs=json.loads(metadata.get('expected_outputs', '[]')),
-                research_scope=json.loads(metadata.get('research_scope', '{}')),
+                validation_targets=_loads(metadata.get('validation_targets', '[]')),
+                expected_outputs=_loads(metadata.get('expected_outputs', '[]')),
+                research_scope=_loads(metadata.get('research_scope', '{}')),
                 confidence=metadata.get('confidence', 0.0),
                 status=metadata.get('status', 'pending')
             )
             
-            return finding
+            with self._finding_cache_lock:
+                self._finding_cache[chroma_id] = (time.monotonic() + self.chroma_config['finding_cache_ttl'], finding)
+                self._finding_cache.move_to_end(chroma_id)
+                if len(self._finding_cache) > self.chroma_config['finding_cache_size']:
+                    self._finding_cache.popitem(last=False)
+            
+            return copy.deepcopy(finding)
             
         except Exception as e:
             logger.error(f"❌ Failed to retrieve from ChromaDB: {e}")
             return None
     
+    def _embed_query(self, normalized_query: str) -> Tuple[float, ...]:
+        """Embed a normalized search query (cached by self._query_embedding)"""
+        return tuple(self.embeddings.embed_query(normalized_query))
+    
+    def get_query_embedding(self, query: str) -> Tuple[float, ...]:
+        """Embedding for a search query, shared across equivalent spellings"""
+        return self._query_embedding(' '.join(query.lower().split()))
+    
     def semantic_search(self, query: str, quarter: Optional[str] = None, 
-                       theme_type: Optional[str] = None, n_results: int = 10) -> List[Dict[str, Any]]:
-        """Perform semantic search across research findings"""
+                       theme_type: Optional[str] = None, n_results: int = 10,
+                       include_documents: bool = True) -> List[Dict[str, Any]]:
+        """Perform semantic search across research findings
+        
+        With include_documents=False only metadata and distances are transferred and
+        each result's 'document' is None; fetch the full text later with get_documents().
+        """
         
         try:
             # Build where clause for filtering
@@ -162,21 +606,25 @@ class ChromaDBManager:
             
             # Perform semantic search
             results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[list(self.get_query_embedding(query))],
                 n_results=n_results,
                 where=where_clause if where_clause else None,
-                include=['documents', 'metadatas', 'distances']
+                include=['documents', 'metadatas', 'distances'] if include_documents else ['metadatas', 'distances']
             )
             
             # Format results
             search_results = []
-            if results['documents'] and results['documents'][0]:
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results['documents'][0],
+            if results['ids'] and results['ids'][0]:
+                count = len(results['ids'][0])
+                documents = results['documents'][0] if include_documents and results.get('documents') else [None] * count
+                for i, (chroma_id, doc, metadata, distance) in enumerate(zip(
+                    results['ids'][0],
+                    documents,
                     results['metadatas'][0],
-                    results['distances'][0] if results['distances'] else [0] * len(results['documents'][0])
+                    results['distances'][0] if results['distances'] else [0] * count
                 )):
                     search_results.append({
+                        'id': chroma_id,
                         'document': doc,
                         'metadata': metadata,
                         'similarity': 1 - distance,  # Convert distance to similarity
@@ -190,6 +638,20 @@ class ChromaDBManager:
             logger.error(f"❌ Semantic search failed: {e}")
             return []
     
+    def get_documents(self, chroma_ids: List[str]) -> Dict[str, str]:
+        """Fetch full research content for the given IDs in one call"""
+        
+        if not chroma_ids:
+            return {}
+        
+        try:
+            result = self.collection.get(ids=list(chroma_ids), include=['documents'])
+            return dict(zip(result['ids'], result['documents']))
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch documents from ChromaDB: {e}")
+            return {}
+    
     def get_research_by_quarter(self, quarter: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all research findings for a specific quarter"""
         
@@ -215,43 +677,92 @@ class ChromaDBManager:
             logger.error(f"❌ Failed to retrieve quarter findings: {e}")
             return []
     
+    def iter_quarter_metadata(self, quarter: str, page_size: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (chroma_id, metadata) for every finding in a quarter, one page at a time"""
+        
+        offset = 0
+        while True:
+            page = self.collection.get(
+                where={'quarter': quarter},
+                limit=page_size,
+                offset=offset,
+                include=['metadatas']
+            )
+            if not page['ids']:
+                return
+            yield from zip(page['ids'], page['metadatas'])
+            if len(page['ids']) < page_size:
+                return
+            offset += page_size
+    
     def update_finding_confidence(self, chroma_id: str, confidence: float, status: str = 'completed'):
         """Update confidence score and status for a finding"""
         
+        updated = self.update_findings_confidence([(chroma_id, confidence, status)])
+        if updated:
+            logger.info(f"✅ Updated ChromaDB finding confidence: {chroma_id} -> {confidence:.3f}")
+        return bool(updated)
+    
+    def update_findings_confidence(self, updates: List[Tuple[str, float, str]]) -> List[str]:
+        """Update confidence/status for several findings with a single ChromaDB update"""
+        
+        if not updates:
+            return []
+        
         try:
-            # ChromaDB doesn't support direct metadata updates, so we need to:
-            # 1. Get the current document
-            # 2. Update metadata
-            # 3. Re-add with same ID (overwrites)
+            # Only fetch the current metadata of findings with no local copy, all at once
+            metadatas = {}
+            missing = []
+            for chroma_id, _, _ in updates:
+                shadow = self._shadow.get(chroma_id)
+                if shadow:
+                    metadatas[chroma_id] = shadow[1]
+                else:
+                    missing.append(chroma_id)
             
-            current = self.collection.get(
-                ids=[chroma_id],
-                include=['documents', 'metadatas']
-            )
-            
-            if not current['documents']:
-                logger.warning(f"⚠️  Cannot update - finding not found: {chroma_id}")
-                return False
+            if missing:
+                current = self.collection.get(
+                    ids=missing,
+                    include=['documents', 'metadatas']
+                )
+                fetched = [dict(metadata) for metadata in current['metadatas']]
+                self._shadow.put_many(current['ids'], current['documents'], fetched)
+                metadatas.update(zip(current['ids'], fetched))
+                
+                for chroma_id in missing:
+                    if chroma_id not in metadatas:
+                        logger.warning(f"⚠️  Cannot update - finding not found: {chroma_id}")
             
             # Update metadata
-            metadata = current['metadatas'][0]
-            metadata['confidence'] = confidence
-            metadata['status'] = status
-            metadata['updated_at'] = datetime.now().isoformat()
-            
-            # Re-add with updated metadata
-            self.collection.upsert(
-                documents=current['documents'],
-                metadatas=[metadata],
-                ids=[chroma_id]
+            updated_at = datetime.now().isoformat()
+            for chroma_id, confidence, status in updates:
+                metadata = metadatas.get(chroma_id)
+                if metadata is not None:
+                    metadata['confidence'] = confidence
+                    metadata['status'] = status
+                    metadata['updated_at'] = updated_at
+            
+            ids = list(metadatas)
+            if not ids:
+                return []
+            
+            # Metadata-only update: the stored documents and embeddings are left as they are
+            self.collection.update(
+                metadatas=[metadatas[chroma_id] for chroma_id in ids],
+                ids=ids
             )
+            with self._finding_cache_lock:
+                for chroma_id in ids:
+                    self._shadow.update_metadata(chroma_id, metadatas[chroma_id])
+                    self._finding_cache.pop(chroma_id, None)
             
-            logger.info(f"✅ Updated ChromaDB finding confidence: {chroma_id} -> {confidence:.3f}")
-            return True
+            if len(ids) > 1:
+                logger.info(f"✅ Updated ChromaDB confidence for {len(ids)} findings")
+            return ids
             
         except Exception as e:
             logger.error(f"❌ Failed to update ChromaDB confidence: {e}")
-            return False
+            return []
 
 class ResearchStorageManager:
     """Integrated storage manager for research findings"""
@@ -261,6 +772,15 @@ class ResearchStorageManager:
         self.etso_access = ETSODataAccess(db_manager)
         self.chroma_manager = ChromaDBManager(config)
         
+        chroma_config = config.chroma.CHROMA_CONFIG
+        self.report_cache = SemanticResultCache(
+            threshold=chroma_config['semantic_cache_threshold'],
+            max_rows=chroma_config['semantic_cache_size']
+        )
+        
+        # Runs the ChromaDB add alongside the ETSO insert in store_research_finding
+        self._write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='research-store')
+        
         logger.info("✅ Research storage manager initialized")
     
     def store_research_finding(self, finding: ResearchFinding) -> Tuple[str, int]:
@@ -269,8 +789,13 @@ class ResearchStorageManager:
         logger.info(f"💾 Storing research finding: {finding.theme_type} for {finding.quarter}")
         
         try:
-            # 1. Store in ChromaDB first (with vector embedding)
-            chroma_id = self.chroma_manager.store_research_finding(finding)
+            # The ChromaDB ID is generated up front, so both writes can run concurrently
+            chroma_id = str(uuid.uuid4())
+            
+            # 1. Store in ChromaDB (with vector embedding), in the background
+            chroma_future = self._write_executor.submit(
+                self.chroma_manager.store_research_finding, finding, chroma_id
+            )
             
             # 2. Store metadata in ETSO database
             metadata = {
@@ -282,7 +807,18 @@ class ResearchStorageManager:
                 'status': finding.status
             }
             
-            research_id = self.etso_access.store_research_metadata(metadata)
+            try:
+                research_id = self.etso_access.store_research_metadata(metadata)
+            finally:
+                # Always wait for the ChromaDB write before returning or raising
+                chroma_error = chroma_future.exception()
+            
+            if chroma_error is not None:
+                # Don't leave an ETSO row pointing at a document that was never stored
+                self._delete_orphaned_metadata(research_id)
+                raise chroma_error
+            
+            self.report_cache.invalidate(finding.quarter)
             
             logger.info(f"✅ Research finding stored: ChromaDB={chroma_id}, ETSO DB={research_id}")
             return chroma_id, research_id
@@ -291,6 +827,13 @@ class ResearchStorageManager:
             logger.error(f"❌ Failed to store research finding: {e}")
             raise
     
+    def _delete_orphaned_metadata(self, research_id: int):
+        """Remove an ETSO metadata row whose ChromaDB write failed"""
+        try:
+            self.etso_access.delete_research_metadata(research_id)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not remove orphaned research metadata {research_id}: {e}")
+    
     def get_research_finding(self, research_id: int) -> Optional[ResearchFinding]:
         """Get complete research finding by ETSO database ID"""
         
@@ -329,6 +872,7 @@ class ResearchStorageManager:
                 self.chroma_manager.update_finding_confidence(
                     metadata['chroma_id'], confidence, status
                 )
+                self.report_cache.invalidate(metadata.get('quarter'))
             
             logger.info(f"✅ Updated research confidence: {research_id} -> {confidence:.3f}")
             
@@ -336,12 +880,48 @@ class ResearchStorageManager:
             logger.error(f"❌ Failed to update research confidence: {e}")
             raise
     
+    def update_research_confidence_many(self, updates: List[Tuple[int, float, str]]):
+        """Update confidence for several research findings: one ETSO UPDATE, one ChromaDB update"""
+        
+        if not updates:
+            return
+        
+        try:
+            # 1. Update ETSO database
+            self.etso_access.update_research_confidence_many(updates)
+            
+            # 2. Look up all ChromaDB IDs at once and update there too
+            metadata_by_id = self.etso_access.get_research_metadata_many([research_id for research_id, _, _ in updates])
+            chroma_updates = [
+                (metadata_by_id[research_id]['chroma_id'], confidence, status)
+                for research_id, confidence, status in updates
+                if research_id in metadata_by_id
+            ]
+            self.chroma_manager.update_findings_confidence(chroma_updates)
+            
+            for quarter in {metadata['quarter'] for metadata in metadata_by_id.values()}:
+                self.report_cache.invalidate(quarter)
+            
+            logger.info(f"✅ Updated research confidence for {len(updates)} findings")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to update research confidence: {e}")
+            raise
+    
     def semantic_search_for_report(self, topic: str, quarter: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search for relevant research findings to include in reports"""
         
         logger.info(f"🔍 Searching for report content: {topic} in {quarter}")
         
         try:
+            # Reuse results of a previous, semantically equivalent topic search
+            cache_key = (quarter, limit)
+            topic_vector = SemanticResultCache.normalize(self.chroma_manager.get_query_embedding(topic))
+            cached_results = self.report_cache.lookup(cache_key, topic_vector)
+            if cached_results is not None:
+                logger.info(f"♻️  Reusing cached report results for: {topic}")
+                return cached_results
+            
             # Semantic search in ChromaDB
             search_results = self.chroma_manager.semantic_search(
                 query=topic,
@@ -349,86 +929,76 @@ class ResearchStorageManager:
                 n_results=limit
             )
             
-            # Enrich with ETSO database validation data
+            # Enrich with ETSO database validation data (one query for all results)
+            chroma_ids = [result['id'] for result in search_results]
+            research_by_chroma_id = self._find_research_with_validation(chroma_ids)
+            
             enriched_results = []
-            for result in search_results:
-                chroma_id = result['metadata'].get('chroma_id')
-                
-                # Try to find corresponding research metadata
-                research_metadata = self._find_research_by_chroma_id(chroma_id)
+            for result, chroma_id in zip(search_results, chroma_ids):
+                research_metadata, validation_summary = research_by_chroma_id.get(chroma_id, (None, None))
                 
                 enriched_result = {
                     **result,
                     'research_metadata': research_metadata,
-                    'validation_summary': self._get_validation_summary(research_metadata['id']) if research_metadata else None
+                    'validation_summary': validation_summary
                 }
                 
                 enriched_results.append(enriched_result)
             
+            self.report_cache.store(cache_key, topic_vector, enriched_results)
             return enriched_results
             
         except Exception as e:
             logger.error(f"❌ Semantic search for report failed: {e}")
             return []
     
-    def _find_research_by_chroma_id(self, chroma_id: str) -> Optional[Dict[str, Any]]:
-        """Find research metadata by ChromaDB ID"""
+    def _find_research_with_validation(self, chroma_ids: List[str]) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Research metadata and validation summary for several ChromaDB IDs, keyed by chroma_id"""
         
-        try:
-            query = "SELECT * FROM research_metadata WHERE chroma_id = %s"
-            results = self.db_manager.execute_etso_query(query, (chroma_id,))
-            
-            if results:
-                row = results[0]
-                return {
-                    'id': row[0],
-                    'chroma_id': row[1],
-                    'quarter': row[2],
-                    'theme_type': row[3],
-                    'user_guidance': row[4],
-                    'enhanced_query': row[5],
-                    'validation_score': row[6],
-                    'overall_confidence': row[7],
-                    'status': row[8]
-                }
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to find research by ChromaDB ID: {e}")
-            return None
-    
-    def _get_validation_summary(self, research_id: int) -> Optional[Dict[str, Any]]:
-        """Get validation summary for research finding"""
+        chroma_ids = [chroma_id for chroma_id in dict.fromkeys(chroma_ids) if chroma_id]
+        if not chroma_ids:
+            return {}
         
         try:
-            query = """
+            placeholders = ', '.join(['%s'] * len(chroma_ids))
+            query = f"""
             SELECT 
-                COUNT(*) as total_claims,
-                COUNT(CASE WHEN supports_claim = TRUE THEN 1 END) as supported_claims,
-                AVG(confidence_score) as avg_confidence,
-                MAX(validation_timestamp) as last_validation
-            FROM validation_claims 
-            WHERE research_metadata_id = %s
+                rm.id, rm.chroma_id, rm.quarter, rm.theme_type,
+                rm.validation_score, rm.overall_confidence, rm.status,
+                vc.total_claims, vc.supported_claims, vc.avg_confidence, vc.last_validation
+            FROM research_metadata rm
+            LEFT JOIN research_validation_summary vc ON vc.research_metadata_id = rm.id
+            WHERE rm.chroma_id IN ({placeholders})
             """
             
-            results = self.db_manager.execute_etso_query(query, (research_id,))
+            rows = self._query_etso_dicts(query, tuple(chroma_ids))
             
-            if results:
-                row = results[0]
-                return {
-                    'total_claims': row[0],
-                    'supported_claims': row[1],
-                    'avg_confidence': float(row[2]) if row[2] else 0.0,
-                    'last_validation': row[3],
-                    'support_rate': (row[1] / row[0]) if row[0] > 0 else 0.0
+            research_by_chroma_id = {}
+            for row in rows:
+                total_claims = row.pop('total_claims') or 0
+                supported_claims = row.pop('supported_claims') or 0
+                avg_confidence = row.pop('avg_confidence')
+                validation_summary = {
+                    'total_claims': total_claims,
+                    'supported_claims': supported_claims,
+                    'avg_confidence': float(avg_confidence) if avg_confidence else 0.0,
+                    'last_validation': row.pop('last_validation'),
+                    'support_rate': (supported_claims / total_claims) if total_claims > 0 else 0.0
                 }
+                research_by_chroma_id[row['chroma_id']] = (row, validation_summary)
             
-            return None
+            return research_by_chroma_id
             
         except Exception as e:
-            logger.error(f"❌ Failed to get validation summary: {e}")
-            return None
+            logger.error(f"❌ Failed to find research by ChromaDB IDs: {e}")
+            return {}
+    
+    def _query_etso_dicts(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        """Run a read query on the ETSO database, returning rows keyed by column name"""
+        with self.db_manager.get_etso_connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            cursor.execute(query, params or ())
+            return list(cursor.fetchall())
     
     def get_quarterly_research_summary(self, quarter: str) -> Dict[str, Any]:
         """Get comprehensive summary of research for a quarter"""
@@ -437,8 +1007,11 @@ class ResearchStorageManager:
             # Get summary from ETSO database
             db_summary = self.etso_access.get_quarterly_summary(quarter)
             
-            # Get research findings from ChromaDB
-            chroma_findings = self.chroma_manager.get_research_by_quarter(quarter)
+            # Get research findings from ChromaDB (metadata only, paged, every finding in the quarter)
+            chroma_findings = [
+                {'metadata': metadata}
+                for _, metadata in self.chroma_manager.iter_quarter_metadata(quarter)
+            ]
             
             # Combine into comprehensive summary
             return {
@@ -457,31 +1030,29 @@ class ResearchStorageManager:
     def _summarize_by_theme(self, findings: List[Dict[str, Any]]) -> Dict[str, int]:
         """Summarize findings by theme type"""
         
-        theme_counts = {}
-        for finding in findings:
-            theme = finding['metadata'].get('theme_type', 'unknown')
-            theme_counts[theme] = theme_counts.get(theme, 0) + 1
-        
-        return theme_counts
+        return dict(Counter(finding['metadata'].get('theme_type', 'unknown') for finding in findings))
     
     def _analyze_confidence_distribution(self, findings: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze confidence score distribution"""
         
-        confidences = [
-            finding['metadata'].get('confidence', 0.0) 
-            for finding in findings 
-            if finding['metadata'].get('confidence') is not None
-        ]
+        confidences = np.fromiter(
+            (
+                finding['metadata']['confidence']
+                for finding in findings
+                if finding['metadata'].get('confidence') is not None
+            ),
+            dtype=np.float64
+        )
         
-        if not confidences:
+        if not confidences.size:
             return {'count': 0, 'avg': 0.0, 'high': 0, 'medium': 0, 'low': 0}
         
         return {
-            'count': len(confidences),
-            'avg': sum(confidences) / len(confidences),
-            'high': len([c for c in confidences if c >= 0.8]),
-            'medium': len([c for c in confidences if 0.5 <= c < 0.8]),
-            'low': len([c for c in confidences if c < 0.5])
+            'count': int(confidences.size),
+            'avg': float(confidences.mean()),
+            'high': int(np.count_nonzero(confidences >= 0.8)),
+            'medium': int(np.count_nonzero((confidences >= 0.5) & (confidences < 0.8))),
+            'low': int(np.count_nonzero(confidences < 0.5))
         }
 
 # Convenience function to create storage manager
@@ -3,36 +3,65 @@
 Test both database connections for OBSERVATORIO ETS
 """
 
+import os
 import pymysql
 import sys
+from dotenv import load_dotenv
+
+# Credentials come from the environment (or .env), not from source
+load_dotenv()
+
+_BASE_CONFIG = {
+    'host': os.getenv('RDS_HOST', 'sbc-database.caa4nswcizpd.eu-west-1.rds.amazonaws.com'),
+    'port': int(os.getenv('RDS_PORT', '3306')),
+    'user': os.getenv('RDS_USER', 'ai'),
+    'charset': 'utf8mb4'
+}
+_PASSWORD = os.getenv('RDS_PASSWORD', '')
+
+# Open connections keyed by server and user; both databases live on the same RDS
+# instance, so one session is shared and switched between them with USE
+_CONNECTIONS = {}
+
+def _get_connection(config):
+    """Return the cached server connection switched to config['database']"""
+    key = (config['host'], config['port'], config['user'])
+    conn = _CONNECTIONS.get(key)
+    if conn is None:
+        server_config = {k: v for k, v in config.items() if k != 'database'}
+        conn = _CONNECTIONS[key] = pymysql.connect(**server_config)
+    else:
+        conn.ping(reconnect=True)
+    conn.select_db(config['database'])
+    return conn
+
+def _close_connections():
+    """Close all cached connections"""
+    while _CONNECTIONS:
+        _, conn = _CONNECTIONS.popitem()
+        try:
+            conn.close()
+        except Exception:
+            pass
 
 def test_imo_connection():
     """Test connection to IMO (traffic) database"""
     print("🔍 Testing IMO Database Connection")
     print("=" * 50)
     
-    config = {
-        'host': 'sbc-database.caa4nswcizpd.eu-west-1.rds.amazonaws.com',
-        'port': 3306,
-        'user': 'ai',
-        'password': 'elpatiodemicasa',
-        'database': 'imo',
-        'charset': 'utf8mb4'
-    }
+    config = {**_BASE_CONFIG, 'password': _PASSWORD, 'database': 'imo'}
     
     try:
         print(f"Connecting to {config['host']}/{config['database']}...")
-        conn = pymysql.connect(**config)
+        conn = _get_connection(config)
         cursor = conn.cursor()
         
-        # Test key tables
+        # Test key tables (all counts in one round trip)
         tables = ['escalas', 'vessels', 'ports']
-        for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
+        cursor.execute("SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables))
+        for table, count in zip(tables, cursor.fetchone()):
             print(f"✅ Table {table}: {count:,} records")
         
-        conn.close()
         print("✅ IMO database connection successful!\n")
         return True
         
@@ -45,18 +74,11 @@ def test_etso_connection():
     print("🔍 Testing ETSO Database Connection")
     print("=" * 50)
     
-    config = {
-        'host': 'sbc-database.caa4nswcizpd.eu-west-1.rds.amazonaws.com',
-        'port': 3306,
-        'user': 'ai',
-        'password': 'elpatiodemicasa',
-        'database': 'etso',
-        'charset': 'utf8mb4'
-    }
+    config = {**_BASE_CONFIG, 'password': _PASSWORD, 'database': 'etso'}
     
     try:
         print(f"Connecting to {config['host']}/{config['database']}...")
-        conn = pymysql.connect(**config)
+        conn = _get_connection(config)
         cursor = conn.cursor()
         
         # Check if database exists
@@ -64,18 +86,22 @@ def test_etso_connection():
         db_name = cursor.fetchone()[0]
         print(f"✅ Connected to database: {db_name}")
         
-        # Check for tables
-        cursor.execute("SHOW TABLES")
-        tables = cursor.fetchall()
+        # Check for tables (names, engine and size estimates in one round trip)
+        cursor.execute("SHOW TABLE STATUS")
+        columns = [column[0] for column in cursor.description]
+        tables = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
         if tables:
             print(f"✅ Found {len(tables)} tables:")
             for table in tables:
-                print(f"   - {table[0]}")
+                if table['Engine']:
+                    size_kb = ((table['Data_length'] or 0) + (table['Index_length'] or 0)) / 1024
+                    print(f"   - {table['Name']} ({table['Engine']}, ~{table['Rows'] or 0:,} rows, {size_kb:,.0f} KB)")
+                else:
+                    print(f"   - {table['Name']} ({table['Comment'] or 'view'})")
         else:
             print("⚠️  No tables found (need to run schema.sql)")
         
-        conn.close()
         print("✅ ETSO database connection successful!\n")
         return True
         
@@ -94,8 +120,14 @@ def main():
     print("=" * 50)
     print()
     
-    imo_ok = test_imo_connection()
-    etso_ok = test_etso_connection()
+    if not _PASSWORD:
+        print("⚠️  RDS_PASSWORD is not set (export it or add it to .env)\n")
+    
+    try:
+        imo_ok = test_imo_connection()
+        etso_ok = test_etso_connection()
+    finally:
+        _close_connections()
     
     print("=" * 50)
     print("📊 Summary:")
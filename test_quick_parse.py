@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Test the rule-based validation logic parse that skips the LLM"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from sql_builder import ValidationLogicParser
+
+@pytest.mark.parametrize("logic", [
+    "Check transit times on asia-europe in Q1 2025",
+    "Verify asia-europe delays increased",
+    "Check port congestion at long beach",
+    "Check if Maersk vessels increased port calls to Rotterdam in Q1 2025",
+    "Check MSC and Maersk delays",
+], ids=["lowercase_route_after_on", "bare_hyphenated_route", "lowercase_port", "capitalized_port", "two_companies"])
+def test_unknown_terms_need_llm(logic):
+    """Logics naming anything beyond one known company fall back to the LLM"""
+    
+    assert ValidationLogicParser._quick_parse(logic) is None
+
+def test_company_and_period_parsed():
+    """A logic made of rule keywords, one company and a period is parsed without the LLM"""
+    
+    components = ValidationLogicParser._quick_parse("Check Maersk transit times in Q1 2025 compared to Q4 2024")
+    
+    assert components.claim_type == 'transit_time'
+    assert components.vessel_filter == 'Maersk'
+    assert components.companies == ('maersk',)
+    assert components.period_filter == 'Q1 2025'
+    assert components.route_filter is None
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
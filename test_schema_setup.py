@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Test splitting setup SQL files into statements pymysql can execute"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup'))
+
+import pytest
+
+from schema_setup import SchemaSetup
+
+SETUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup')
+
+@pytest.mark.parametrize("filename", ["schema.sql", "add_validation_summary.sql"])
+def test_delimiter_blocks_split(filename):
+    """DELIMITER directives are resolved, leaving each trigger and procedure as one statement"""
+    
+    with open(os.path.join(SETUP_DIR, filename), 'r', encoding='utf-8') as f:
+        statements = SchemaSetup._split_sql_statements(f.read())
+    
+    assert not [s for s in statements if s.upper().startswith('DELIMITER') or s.endswith('//')]
+    
+    bodies = [s for s in statements if s.startswith(('CREATE TRIGGER', 'CREATE PROCEDURE'))]
+    assert bodies
+    for body in bodies:
+        # The whole BEGIN ... END block, with its inner semicolons
+        assert 'BEGIN' in body and body.endswith('END')
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -7,30 +7,24 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import DatabaseManager
 from config import SystemConfig
+from pymysql.constants.ER import DUP_FIELDNAME as ER_DUP_FIELDNAME
+import pymysql
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-config = SystemConfig()
-db_manager = DatabaseManager(config)
-
-def update_schema():
+def update_schema(db_manager: DatabaseManager):
     """Add validation_weight to validation_claims and sources to research_metadata"""
     with db_manager.get_etso_connection() as conn:
         cursor = conn.cursor()
         
         try:
-            # Add validation_weight column to validation_claims
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM information_schema.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE()
-                AND TABLE_NAME = 'validation_claims' 
-                AND COLUMN_NAME = 'validation_weight'
-            """)
+            # MySQL has no ADD COLUMN IF NOT EXISTS, so issue the ALTER directly
+            # and treat "duplicate column" as already migrated
             
-            if cursor.fetchone()[0] == 0:
+            # Add validation_weight column to validation_claims
+            try:
                 cursor.execute("""
                     ALTER TABLE validation_claims 
                     ADD COLUMN validation_weight DECIMAL(5,2) DEFAULT 50.00
@@ -38,19 +32,13 @@ def update_schema():
                     AFTER validation_logic
                 """)
                 logger.info("✅ Added validation_weight column to validation_claims")
-            else:
+            except pymysql.err.OperationalError as e:
+                if e.args[0] != ER_DUP_FIELDNAME:
+                    raise
                 logger.info("ℹ️ validation_weight column already exists")
             
             # Add sources column to research_metadata
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM information_schema.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE()
-                AND TABLE_NAME = 'research_metadata' 
-                AND COLUMN_NAME = 'sources'
-            """)
-            
-            if cursor.fetchone()[0] == 0:
+            try:
                 cursor.execute("""
                     ALTER TABLE research_metadata 
                     ADD COLUMN sources JSON DEFAULT NULL
@@ -58,7 +46,9 @@ def update_schema():
                     AFTER research_content_preview
                 """)
                 logger.info("✅ Added sources column to research_metadata")
-            else:
+            except pymysql.err.OperationalError as e:
+                if e.args[0] != ER_DUP_FIELDNAME:
+                    raise
                 logger.info("ℹ️ sources column already exists")
                 
             conn.commit()
@@ -70,4 +60,4 @@ def update_schema():
 
 if __name__ == "__main__":
     logger.info("🔧 Updating database schema for claims refactor")
-    update_schema()
\ No newline at end of file
+    update_schema(DatabaseManager(SystemConfig()))
\ No newline at end of file
@@ -7,30 +7,22 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import DatabaseManager
 from config import SystemConfig
+from pymysql.constants.ER import DUP_FIELDNAME as ER_DUP_FIELDNAME
+import pymysql
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-config = SystemConfig()
-db_manager = DatabaseManager(config)
-
-def add_theme_title_column():
+def add_theme_title_column(db_manager: DatabaseManager):
     """Add theme_title column to research_metadata table"""
     with db_manager.get_etso_connection() as conn:
         cursor = conn.cursor()
         
         try:
-            # Check if column already exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM information_schema.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE()
-                AND TABLE_NAME = 'research_metadata' 
-                AND COLUMN_NAME = 'theme_title'
-            """)
-            
-            if cursor.fetchone()[0] == 0:
+            # MySQL has no ADD COLUMN IF NOT EXISTS, so issue the ALTER directly
+            # and treat "duplicate column" as already migrated
+            try:
                 cursor.execute("""
                     ALTER TABLE research_metadata 
                     ADD COLUMN theme_title VARCHAR(100) DEFAULT NULL
@@ -38,14 +30,16 @@ def add_theme_title_column():
                 """)
                 conn.commit()
                 logger.info("✅ Added theme_title column to research_metadata table")
-            else:
+            except pymysql.err.OperationalError as e:
+                if e.args[0] != ER_DUP_FIELDNAME:
+                    raise
                 logger.info("ℹ️ theme_title column already exists")
                 
         except Exception as e:
             logger.error(f"Error adding column: {e}")
             raise
 
-def generate_theme_titles():
+def generate_theme_titles(db_manager: DatabaseManager):
     """Generate brief titles based on user_guidance content"""
     
     theme_titles = {
@@ -99,28 +93,39 @@ def generate_theme_titles():
         cursor = conn.cursor()
         
         try:
-            for theme_id, title in theme_titles.items():
-                cursor.execute("""
-                    UPDATE research_metadata 
-                    SET theme_title = %s 
-                    WHERE id = %s
-                """, (title, theme_id))
+            # One UPDATE for all titles instead of a round trip per theme
+            cases = ' '.join(['WHEN %s THEN %s'] * len(theme_titles))
+            placeholders = ', '.join(['%s'] * len(theme_titles))
+            params = [value for theme_id, title in theme_titles.items() for value in (theme_id, title)]
+            params += list(theme_titles)
+            cursor.execute(f"""
+                UPDATE research_metadata 
+                SET theme_title = CASE id {cases} END 
+                WHERE id IN ({placeholders})
+            """, params)
             
             conn.commit()    
             logger.info(f"✅ Updated {len(theme_titles)} theme titles")
             
-            # Log themes without titles for verification
-            cursor.execute("""
-                SELECT id, LEFT(user_guidance, 50) 
-                FROM research_metadata 
-                WHERE theme_title IS NULL
-            """)
+            # Log themes without titles for verification, streamed row by row
+            # from the server instead of buffering the whole result
+            stream = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                stream.execute("""
+                    SELECT id, LEFT(user_guidance, 50) 
+                    FROM research_metadata 
+                    WHERE theme_title IS NULL
+                """)
+                
+                missing = 0
+                for theme_id, guidance in stream:
+                    missing += 1
+                    logger.info(f"  - ID {theme_id}: {guidance}...")
+            finally:
+                stream.close()
             
-            missing = cursor.fetchall()
             if missing:
-                logger.warning(f"⚠️ {len(missing)} themes still without titles")
-                for theme_id, guidance in missing:
-                    logger.info(f"  - ID {theme_id}: {guidance}...")
+                logger.warning(f"⚠️ {missing} themes still without titles")
                     
         except Exception as e:
             logger.error(f"Error updating titles: {e}")
@@ -129,11 +134,13 @@ def generate_theme_titles():
 def main():
     logger.info("🔧 Updating theme titles in ETSO database")
     
+    db_manager = DatabaseManager(SystemConfig())
+    
     # Add column if it doesn't exist
-    add_theme_title_column()
+    add_theme_title_column(db_manager)
     
     # Generate and update titles
-    generate_theme_titles()
+    generate_theme_titles(db_manager)
     
     logger.info("✅ Theme titles update complete")
 
@@ -3,13 +3,26 @@ OBSERVATORIO ETS - Dual Database Validation System
 Validates research findings against vessel traffic data
 """
 
-import re
+import io
+import os
+import csv
 import json
+import asyncio
+import hashlib
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import functools
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple, Literal
 from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+from pymysql.converters import escape_item
+from langchain_core.embeddings import Embeddings
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from database import DatabaseManager, TrafficDataAccess, ETSODataAccess
 
@@ -27,19 +40,280 @@ class ValidationClaim:
     expected_change: Optional[str] = None
     confidence: float = 0.0
 
+class ExtractionCache:
+    """Content-addressed on-disk cache of parsed LLM responses"""
+    
+    PROMPT_VERSION = b"v3"
+    
+    def __init__(self, root: str):
+        self.root = root
+    
+    @classmethod
+    def make_key(cls, model_name: str, *parts: str) -> str:
+        digest = hashlib.sha256(cls.PROMPT_VERSION + model_name.encode())
+        for part in parts:
+            encoded = part.encode()
+            # Length-prefix each part so adjacent parts can't collide
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable cache entry {key}: {e}")
+            return None
+    
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write cache entry {key}: {e}")
+
+class SemanticClaimCache:
+    """Claim validations reused when a new claim's embedding is close to an earlier one"""
+    
+    def __init__(self, path: str, threshold: float = 0.92, max_rows: int = 4096):
+        self.path = path
+        self.threshold = threshold
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        # Row i of the normalized float32 matrix belongs to scopes[i] / payloads[i]
+        self._matrix: Optional[np.ndarray] = None
+        self._scopes: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        # Rows added since the last save; writes are serialized since they share temporary files
+        self._dirty = False
+        self._write_lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.array(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+    
+    def lookup(self, scope: str, vector: np.ndarray) -> Optional[Dict[str, Any]]:
+        if self._matrix is not None:
+            similarities = self._matrix @ vector
+            # Only claims about the same claim type and period are interchangeable
+            similarities[np.asarray(self._scopes) != scope] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                self.hits += 1
+                return self._payloads[best]
+        self.misses += 1
+        return None
+    
+    def add(self, scope: str, vector: np.ndarray, payload: Dict[str, Any]):
+        if self._matrix is None:
+            self._matrix = vector[np.newaxis, :].copy()
+        else:
+            self._matrix = np.vstack([self._matrix, vector])
+        self._scopes.append(scope)
+        self._payloads.append(payload)
+        self._dirty = True
+        
+        if len(self._payloads) > self.max_rows:
+            # Drop the oldest rows
+            excess = len(self._payloads) - self.max_rows
+            self._matrix = self._matrix[excess:]
+            del self._scopes[:excess], self._payloads[:excess]
+    
+    def save(self):
+        snapshot = self._snapshot()
+        if snapshot:
+            self._write(*snapshot)
+    
+    async def asave(self):
+        """save() with the file writes in a worker thread, so the event loop keeps running"""
+        snapshot = self._snapshot()
+        if snapshot:
+            await asyncio.to_thread(self._write, *snapshot)
+    
+    def _snapshot(self) -> Optional[Tuple[np.ndarray, List[str], List[Dict[str, Any]]]]:
+        """Consistent copy of unsaved rows; add() replaces the matrix rather than mutating it"""
+        if self._matrix is None or not self._dirty:
+            return None
+        self._dirty = False
+        return self._matrix, list(self._scopes), list(self._payloads)
+    
+    def _write(self, matrix: np.ndarray, scopes: List[str], payloads: List[Dict[str, Any]]):
+        with self._write_lock:
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                matrix_path = os.path.join(self.path, 'embeddings.npy')
+                payloads_path = os.path.join(self.path, 'payloads.json')
+                with open(f"{matrix_path}.tmp", 'wb') as f:
+                    np.save(f, matrix)
+                with open(f"{payloads_path}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump({'scopes': scopes, 'payloads': payloads}, f, ensure_ascii=False)
+                os.replace(f"{matrix_path}.tmp", matrix_path)
+                os.replace(f"{payloads_path}.tmp", payloads_path)
+            except OSError as e:
+                logger.warning(f"⚠️  Could not save semantic claim cache: {e}")
+    
+    def _load(self):
+        try:
+            matrix = np.load(os.path.join(self.path, 'embeddings.npy'))
+            with open(os.path.join(self.path, 'payloads.json'), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable semantic claim cache: {e}")
+            return
+        
+        if len(matrix) == len(stored['scopes']) == len(stored['payloads']):
+            self._matrix = matrix.astype(np.float32)
+            self._scopes, self._payloads = stored['scopes'], stored['payloads']
+            logger.info(f"♻️  Loaded {len(self._payloads)} cached claim validations")
+
+def _is_measure(column: str) -> bool:
+    """Whether a column holds a quantity worth summarizing, rather than an identifier or calendar field"""
+    name = column.lower()
+    return not (name in ('imo', 'id', 'year', 'quarter') or name.endswith('_id') or 'year' in name)
+
+def _summarize_rows(rows: List[tuple], columns: Optional[List[str]] = None,
+                    k: int = 8, max_row_chars: int = 400) -> str:
+    """Compact prompt rendering of query rows: per-column stats over all rows plus the first k as CSV"""
+    if not rows:
+        return "No matching data found"
+    columns = list(columns) if columns else [f"col{i}" for i in range(1, len(rows[0]) + 1)]
+    
+    # Numeric measure columns get stats over every row instead of being shown row by row
+    stats = [f"n={len(rows)}"]
+    for column, values in zip(columns, zip(*rows)):
+        if not _is_measure(column):
+            continue
+        present = [value for value in values if value is not None]
+        if not present or not all(isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+                                   for value in present):
+            continue
+        numbers = np.fromiter((float(value) for value in present), dtype=np.float64, count=len(present))
+        stats.append(
+            f"{column}: mean={numbers.mean():.4g} std={numbers.std():.4g} "
+            f"p50={np.median(numbers):.4g} min={numbers.min():.4g} max={numbers.max():.4g}"
+        )
+    
+    # Long text columns are cut per row so one wide row can't dominate the prompt
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='')
+    writer.writerow(columns)
+    lines = [buffer.getvalue()]
+    for row in rows[:k]:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        line = buffer.getvalue()
+        lines.append(line if len(line) <= max_row_chars else line[:max_row_chars] + '...')
+    
+    summary = ' | '.join(stats) + f"\nFirst {min(k, len(rows))} rows (CSV with header):\n" + '\n'.join(lines)
+    if len(rows) > k:
+        summary += f"\n... and {len(rows) - k} more rows"
+    return summary
+
+def _model_name(llm: ChatOpenAI) -> str:
+    return getattr(llm, 'model_name', None) or getattr(llm, 'model', '') or ''
+
+def _render_prompt(prompt: ChatPromptTemplate) -> Tuple[SystemMessage, str]:
+    """Render a (system, human) prompt's static system message once, keeping the human template"""
+    system_template, human_template = prompt.messages
+    return system_template.format(), human_template.prompt.template
+
+def _structured_llm(llm: ChatOpenAI, schema: type, cache_key: str):
+    """Schema-constrained LLM that reports parsing errors instead of raising them"""
+    # Route requests sharing a static system prompt to OpenAI's prompt cache
+    model_kwargs = {'extra_body': {'prompt_cache_key': cache_key}} if isinstance(llm, ChatOpenAI) else {}
+    return llm.with_structured_output(schema, method='function_calling', include_raw=True, **model_kwargs)
+
+def _retry_messages(messages: List[BaseMessage], error: Any) -> List[BaseMessage]:
+    """Append the validation error so the next attempt can correct itself"""
+    return messages + [HumanMessage(
+        content=f"Your previous response did not match the required schema: {error}. "
+                f"Call the function again with corrected arguments."
+    )]
+
+def _invoke_structured(structured_llm, messages: List[BaseMessage], max_retries: int = 2) -> BaseModel:
+    """Invoke a structured LLM, retrying with the validation error as feedback"""
+    for attempt in range(max_retries + 1):
+        result = structured_llm.invoke(messages)
+        if result['parsed'] is not None:
+            return result['parsed']
+        error = result['parsing_error'] or 'no function call returned'
+        logger.warning(f"⚠️  Structured output attempt {attempt + 1} failed: {error}")
+        messages = _retry_messages(messages, error)
+    raise ValueError(f"No valid structured output after {max_retries + 1} attempts: {error}")
+
+async def _ainvoke_structured(structured_llm, messages: List[BaseMessage], max_retries: int = 2) -> BaseModel:
+    """Async variant of _invoke_structured"""
+    for attempt in range(max_retries + 1):
+        result = await structured_llm.ainvoke(messages)
+        if result['parsed'] is not None:
+            return result['parsed']
+        error = result['parsing_error'] or 'no function call returned'
+        logger.warning(f"⚠️  Structured output attempt {attempt + 1} failed: {error}")
+        messages = _retry_messages(messages, error)
+    raise ValueError(f"No valid structured output after {max_retries + 1} attempts: {error}")
+
+class ExtractedClaim(BaseModel):
+    """Structured LLM output schema for one verifiable claim"""
+    claim_text: str = Field(description="Exact quote from the research")
+    claim_type: str = Field(
+        'general',
+        description="vessel_movement, route_pattern, port_frequency, transit_time or co2_emissions"
+    )
+    vessel: Optional[str] = Field(None, description="Vessel or company name")
+    route: Optional[str] = Field(None, description="Route description")
+    period: Optional[str] = Field(None, description="Time period")
+    metric: Optional[str] = Field(None, description="What is measured")
+    expected_change: Optional[str] = Field(None, description="increase, decrease or pattern")
+
+class ExtractedClaims(BaseModel):
+    """Structured LLM output schema for claim extraction"""
+    claims: List[ExtractedClaim] = Field(default_factory=list)
+
+class ClaimAnalysis(BaseModel):
+    """Structured LLM output schema for one claim's validation analysis"""
+    claim_index: int = Field(description="Number of the claim being analyzed, as given in the request")
+    support: Literal['Yes', 'No', 'Partially']
+    confidence: float = Field(ge=0.0, le=1.0)
+    evidence: str = Field('', description="Key supporting data points")
+    limitations: str = Field('', description="Any data gaps or contradictions")
+
+class ClaimAnalyses(BaseModel):
+    """Structured LLM output schema for a batch of claim analyses"""
+    analyses: List[ClaimAnalysis]
+
 class ClaimExtractor:
     """Extracts verifiable claims from research findings"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, cache: Optional[ExtractionCache] = None):
         self.llm = llm
+        self.cache = cache or ExtractionCache(os.path.join('data', 'claim_cache'))
         self.extraction_prompt = self._create_extraction_prompt()
+        self._system_message, self._human_template = _render_prompt(self.extraction_prompt)
+        self.structured_llm = _structured_llm(llm, ExtractedClaims, 'etso_claim_v1')
     
     def _create_extraction_prompt(self) -> ChatPromptTemplate:
         return ChatPromptTemplate.from_messages([
             ("system", """You are a maritime data analyst expert at extracting verifiable claims from research.
 
-CRITICAL: You must respond with ONLY valid JSON - no explanations, no markdown, no additional text.
-
 Extract specific claims that mention:
 - Vessel names, shipping lines, or fleet data
 - Route changes, port patterns, or corridor shifts  
@@ -53,210 +327,250 @@ Claim types:
 - transit_time: voyage duration changes
 - co2_emissions: carbon footprint variations
 
-Response format: JSON array only, no other text."""),
+Use null for any field the claim doesn't mention."""),
             ("human", """Research content:
 {research_content}
 
 Validation targets: {validation_targets}
 
-Extract verifiable claims as JSON array. Include claims with specific vessels, routes, percentages, or measurable changes:
-
-[
-  {{
-    "claim_text": "exact quote from research",
-    "claim_type": "vessel_movement",
-    "vessel": "vessel/company name or null",
-    "route": "route description or null", 
-    "period": "time period or null",
-    "metric": "what is measured or null",
-    "expected_change": "increase/decrease/pattern or null"
-  }}
-]""")
+Extract verifiable claims. Include claims with specific vessels, routes, percentages, or measurable changes.""")
         ])
     
     def extract_claims(self, research_content: str, validation_targets: List[str]) -> List[ValidationClaim]:
         """Extract verifiable claims from research content"""
         try:
-            response = self.llm.invoke(
-                self.extraction_prompt.format_messages(
-                    research_content=research_content,
-                    validation_targets=validation_targets
-                )
-            )
+            key = self._cache_key(research_content, validation_targets)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._claims_from_dicts(cached)
             
-            # Parse JSON response
-            claims_data = self._parse_json_response(response.content)
+            parsed = _invoke_structured(self.structured_llm, self._format_messages(research_content, validation_targets))
+            return self._claims_from_parsed(parsed, key)
             
-            # Convert to ValidationClaim objects
-            claims = []
-            for claim_dict in claims_data:
-                claim = ValidationClaim(
-                    claim_text=claim_dict.get('claim_text', ''),
-                    claim_type=claim_dict.get('claim_type', 'general'),
-                    vessel=claim_dict.get('vessel'),
-                    route=claim_dict.get('route'),
-                    period=claim_dict.get('period'),
-                    metric=claim_dict.get('metric'),
-                    expected_change=claim_dict.get('expected_change')
-                )
-                claims.append(claim)
+        except Exception as e:
+            logger.error(f"❌ Failed to extract claims: {e}")
+            return []
+    
+    async def aextract_claims(self, research_content: str, validation_targets: List[str]) -> List[ValidationClaim]:
+        """Async variant of extract_claims"""
+        try:
+            key = self._cache_key(research_content, validation_targets)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._claims_from_dicts(cached)
             
-            logger.info(f"✅ Extracted {len(claims)} verifiable claims")
-            return claims
+            parsed = await _ainvoke_structured(
+                self.structured_llm, self._format_messages(research_content, validation_targets)
+            )
+            return self._claims_from_parsed(parsed, key)
             
         except Exception as e:
             logger.error(f"❌ Failed to extract claims: {e}")
             return []
     
-    def _parse_json_response(self, response_text: str) -> List[Dict]:
-        """Parse LLM JSON response, handling potential formatting issues"""
-        # Clean the response text
-        clean_text = response_text.strip()
+    async def aextract_claims_batch(self, items: List[Tuple[str, List[str]]],
+                                    max_concurrency: int = 8) -> List[List[ValidationClaim]]:
+        """Extract claims for several (research_content, validation_targets) pairs concurrently"""
+        if not items:
+            return []
         
-        # Remove markdown code blocks if present
-        if clean_text.startswith('```'):
-            clean_text = re.sub(r'^```(?:json)?\s*', '', clean_text, flags=re.IGNORECASE)
-            clean_text = re.sub(r'```\s*$', '', clean_text)
-            clean_text = clean_text.strip()
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        try:
-            # Try direct JSON parsing
-            return json.loads(clean_text)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Direct JSON parsing failed: {e}")
-            
-            # Try to extract JSON array from text
-            json_patterns = [
-                r'\[[\s\S]*\]',  # Find array brackets with anything inside
-                r'\{[\s\S]*\}',  # Find object brackets as fallback
-            ]
-            
-            for pattern in json_patterns:
-                json_match = re.search(pattern, clean_text, re.DOTALL)
-                if json_match:
-                    try:
-                        extracted = json_match.group()
-                        result = json.loads(extracted)
-                        # Ensure it's a list
-                        return result if isinstance(result, list) else [result]
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Log the problematic response for debugging
-            logger.warning(f"JSON parsing failed for response: {clean_text[:200]}...")
-            
-            # Fallback: manual parsing
-            logger.warning("Using fallback parsing")
-            return self._fallback_parse(clean_text)
+        async def extract(content: str, targets: List[str]) -> List[ValidationClaim]:
+            async with semaphore:
+                return await self.aextract_claims(content, targets)
+        
+        return list(await asyncio.gather(*[extract(content, targets) for content, targets in items]))
+    
+    def _cache_key(self, research_content: str, validation_targets: List[str]) -> str:
+        return ExtractionCache.make_key(
+            _model_name(self.llm), research_content, json.dumps(validation_targets, sort_keys=True)
+        )
+    
+    def _format_messages(self, research_content: str, validation_targets: List[str]) -> List[BaseMessage]:
+        human = self._human_template.format(
+            research_content=research_content,
+            validation_targets=validation_targets
+        )
+        return [self._system_message, HumanMessage(content=human)]
     
-    def _fallback_parse(self, text: str) -> List[Dict]:
-        """Fallback parsing when JSON parsing fails"""
-        logger.info("🔧 Using fallback claim parsing")
+    def _claims_from_parsed(self, parsed: ExtractedClaims, cache_key: Optional[str] = None) -> List[ValidationClaim]:
+        """Convert structured extraction output into ValidationClaim objects"""
+        claims_data = [claim.model_dump() for claim in parsed.claims]
+        
+        # Empty extractions are often transient, so don't pin them
+        if cache_key and claims_data:
+            self.cache.set(cache_key, claims_data)
         
-        # Look for patterns that indicate claims
+        return self._claims_from_dicts(claims_data)
+    
+    def _claims_from_dicts(self, claims_data: List[Dict]) -> List[ValidationClaim]:
+        # Convert to ValidationClaim objects
         claims = []
+        for claim_dict in claims_data:
+            claim = ValidationClaim(
+                claim_text=claim_dict.get('claim_text', ''),
+                claim_type=claim_dict.get('claim_type', 'general'),
+                vessel=claim_dict.get('vessel'),
+                route=claim_dict.get('route'),
+                period=claim_dict.get('period'),
+                metric=claim_dict.get('metric'),
+                expected_change=claim_dict.get('expected_change')
+            )
+            claims.append(claim)
         
-        # Try to find any quoted strings that might be claims
-        claim_patterns = [
-            r'"([^"]*(?:vessel|ship|container|route|port|transit|cargo)[^"]*)"',
-            r'"([^"]*(?:increase|decrease|change|impact|reduction)[^"]*)"',
-            r'"([^"]*(?:Maersk|MSC|COSCO|CMA|Evergreen)[^"]*)"',
-            r'"([^"]*(?:Suez|Red Sea|Mediterranean|Asia|Europe)[^"]*)"'
-        ]
-        
-        for pattern in claim_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) > 20:  # Only substantial claims
-                    claim = {
-                        'claim_text': match,
-                        'claim_type': 'general',
-                        'vessel': None,
-                        'route': None,
-                        'period': None,
-                        'metric': None,
-                        'expected_change': None
-                    }
-                    
-                    # Try to classify the claim type
-                    match_lower = match.lower()
-                    if any(word in match_lower for word in ['vessel', 'ship', 'fleet']):
-                        claim['claim_type'] = 'vessel_movement'
-                    elif any(word in match_lower for word in ['route', 'corridor', 'service']):
-                        claim['claim_type'] = 'route_pattern'
-                    elif any(word in match_lower for word in ['port', 'terminal', 'hub']):
-                        claim['claim_type'] = 'port_frequency'
-                    elif any(word in match_lower for word in ['transit', 'time', 'duration']):
-                        claim['claim_type'] = 'transit_time'
-                    elif any(word in match_lower for word in ['co2', 'carbon', 'emission', 'fuel']):
-                        claim['claim_type'] = 'fuel_consumption'
-                    
-                    claims.append(claim)
-        
-        # Remove duplicates
-        unique_claims = []
-        seen_texts = set()
-        for claim in claims:
-            if claim['claim_text'] not in seen_texts:
-                seen_texts.add(claim['claim_text'])
-                unique_claims.append(claim)
-        
-        logger.info(f"🔧 Fallback parsing extracted {len(unique_claims)} claims")
-        return unique_claims[:5]  # Limit to 5 claims max
+        logger.info(f"✅ Extracted {len(claims)} verifiable claims")
+        return claims
+
+def _like(column: str, value: Any) -> Tuple[str, List[Any]]:
+    """Partial-match condition on a column, with its bind parameter"""
+    return f"{column} LIKE %s", [f"%{value}%"]
+
+def _like_any(conditions: List[Tuple[str, Any]]) -> Tuple[str, List[Any]]:
+    """OR together partial-match conditions as one parenthesized clause"""
+    clauses = [_like(column, value) for column, value in conditions]
+    return "(" + " OR ".join(clause for clause, _ in clauses) + ")", [p for _, params in clauses for p in params]
+
+def _period_bounds(period: str) -> Optional[Tuple[date, date]]:
+    """Half-open [start, end) date range of a "2024Q1" quarter or "2024" year"""
+    compact = period.upper().replace(' ', '').replace('-', '')
+    if len(compact) == 4 and compact.isdigit():
+        year = int(compact)
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    
+    # Accept both "2024Q1" and "Q12024"
+    if len(compact) == 6 and compact[4] == 'Q':
+        year_part, quarter_part = compact[:4], compact[5]
+    elif len(compact) == 6 and compact[0] == 'Q':
+        year_part, quarter_part = compact[2:], compact[1]
+    else:
+        return None
+    if not (year_part.isdigit() and quarter_part in '1234'):
+        return None
+    
+    year, first_month = int(year_part), 1 + (int(quarter_part) - 1) * 3
+    end = date(year + 1, 1, 1) if first_month == 10 else date(year, first_month + 3, 1)
+    return date(year, first_month, 1), end
 
 class ValidationQueryGenerator:
     """Generates SQL queries to validate claims against traffic data"""
     
-    def generate_validation_query(self, claim: ValidationClaim, quarter: str) -> str:
-        """Generate appropriate SQL query based on claim type"""
+    # Claim type -> query builder method, resolved once instead of per call
+    _QUERY_GENERATORS = {
+        'fuel_consumption': '_fuel_consumption_query',
+        'transit_time': '_transit_time_query',
+        'route_pattern': '_route_pattern_query',
+        'port_frequency': '_port_frequency_query',
+        'vessel_movement': '_vessel_movement_query'
+    }
+    
+    # Route kind (see _route_kind) -> route filter builder
+    _ROUTE_FILTERS = {
+        'ports': '_ports_route_filter',
+        'port_pair': '_port_pair_route_filter',
+        'regions': '_regions_route_filter',
+        'single': '_single_route_filter'
+    }
+    
+    # Claim type -> builder of the same query against a materialized period slice (see
+    # TrafficDataAccess.period_slice); only queries that read escalas once can use one
+    _SLICE_QUERY_GENERATORS = {
+        'fuel_consumption': '_fuel_consumption_slice_query',
+        'port_frequency': '_port_frequency_slice_query',
+        'vessel_movement': '_vessel_movement_slice_query'
+    }
+    
+    # Claim type -> post-processing of the fetched rows, for queries that aggregate client-side
+    _POSTPROCESSORS = {
+        'route_pattern': '_postprocess_route_pattern'
+    }
+    
+    def __init__(self):
+        # Claims about the same vessel, route and period share one generated query
+        self._memoized_query = functools.lru_cache(maxsize=512)(self._build_query)
+    
+    def generate_validation_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
+        """Generate appropriate SQL query and its bind parameters based on claim type"""
         
-        query_generators = {
-            'fuel_consumption': self._fuel_consumption_query,
-            'transit_time': self._transit_time_query,
-            'route_pattern': self._route_pattern_query,
-            'port_frequency': self._port_frequency_query,
-            'vessel_movement': self._vessel_movement_query
-        }
+        # Explicit port lists (dicts) aren't hashable, so they skip the memo
+        if isinstance(claim.route, dict):
+            generator = getattr(self, self._QUERY_GENERATORS.get(claim.claim_type, '_general_movement_query'))
+            return generator(claim, quarter)
         
-        generator = query_generators.get(claim.claim_type, self._general_movement_query)
-        return generator(claim, quarter)
+        query, params = self._memoized_query(claim.claim_type, claim.vessel, claim.route, claim.period, quarter)
+        return query, list(params)
+    
+    def _build_query(self, claim_type: str, vessel: Optional[str], route: Optional[str],
+                     period: Optional[str], quarter: str) -> Tuple[str, Tuple[Any, ...]]:
+        """Query for a claim's filter fields, shared by claims about the same vessel, route and period"""
+        claim = ValidationClaim(claim_text='', claim_type=claim_type, vessel=vessel, route=route, period=period)
+        generator = getattr(self, self._QUERY_GENERATORS.get(claim_type, '_general_movement_query'))
+        query, params = generator(claim, quarter)
+        return query, tuple(params)
+    
+    def supports_slice(self, claim: ValidationClaim) -> bool:
+        """Whether the claim's query can run against a materialized period slice"""
+        return claim.claim_type in self._SLICE_QUERY_GENERATORS or claim.claim_type not in self._QUERY_GENERATORS
+    
+    def generate_slice_query(self, claim: ValidationClaim, table: str) -> Tuple[str, List[Any]]:
+        """Generate the claim's query against a materialized slice of its period"""
+        generator = getattr(self, self._SLICE_QUERY_GENERATORS.get(claim.claim_type, '_vessel_movement_slice_query'))
+        return generator(claim, table)
+    
+    def period_slice_filter(self, period: str) -> Tuple[str, List[Any]]:
+        """Period filter that defines a materialized slice"""
+        return self._build_period_filter(period, period)
+    
+    def postprocess(self, claim: ValidationClaim, columns: List[str],
+                    rows: List[tuple]) -> Tuple[List[str], List[tuple]]:
+        """Shape fetched rows and their column names for analysis, according to the claim type's query"""
+        postprocessor = self._POSTPROCESSORS.get(claim.claim_type)
+        return getattr(self, postprocessor)(columns, rows) if postprocessor else (list(columns), list(rows))
     
-    def _fuel_consumption_query(self, claim: ValidationClaim, quarter: str) -> str:
+    @staticmethod
+    def render(query: str, params: List[Any]) -> str:
+        """Inline the bind parameters for display and manual editing"""
+        return query % tuple(escape_item(p, 'utf8mb4') for p in params)
+    
+    def _fuel_consumption_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
         """Generate CO2 emissions validation query using v_MRV data"""
-        vessel_filter = self._build_vessel_filter(claim.vessel)
-        route_filter = self._build_route_filter(claim.route)
-        period_filter = self._build_period_filter(claim.period, quarter)
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel)
+        route_filter, route_params = self._build_route_filter(claim.route)
+        period_filter, period_params = self._build_period_filter(claim.period, quarter)
         
         return f"""
-        SELECT 
-            e.imo,
-            v.name as vessel_name,
-            m.co2nm,
-            COUNT(*) as voyage_count,
-            MIN(e.start) as period_start,
-            MAX(e.start) as period_end
-        FROM escalas e
-        JOIN port_trace pt ON pt.imo = e.imo
-        JOIN v_fleet v ON e.imo = v.imo
-        JOIN v_MRV m ON e.imo = m.imo
-        LEFT JOIN ports p_start ON e.portname = p_start.portname
-        LEFT JOIN ports p_end ON e.next_port = p_end.portname
-        WHERE m.co2nm IS NOT NULL
-        AND m.co2nm > 0
-        {vessel_filter}
-        {route_filter}
-        {period_filter}
-        GROUP BY e.imo, v.name, m.co2nm
-        HAVING voyage_count >= 2
-        ORDER BY m.co2nm DESC
+        SELECT *
+        FROM (
+            SELECT 
+                e.imo,
+                v.name as vessel_name,
+                m.co2nm,
+                COUNT(*) as voyage_count,
+                MIN(e.start) as period_start,
+                MAX(e.start) as period_end
+            FROM escalas e
+            JOIN port_trace pt ON pt.imo = e.imo
+            JOIN v_fleet v ON e.imo = v.imo
+            JOIN v_MRV m ON e.imo = m.imo
+            LEFT JOIN ports p_start ON e.portname = p_start.portname
+            LEFT JOIN ports p_end ON e.next_port = p_end.portname
+            WHERE m.co2nm IS NOT NULL
+            AND m.co2nm > 0
+            {vessel_filter}
+            {route_filter}
+            {period_filter}
+            GROUP BY e.imo, v.name, m.co2nm
+            HAVING voyage_count >= 2
+        ) grouped
+        ORDER BY co2nm DESC
         LIMIT 50
-        """
+        """, vessel_params + route_params + period_params
     
-    def _transit_time_query(self, claim: ValidationClaim, quarter: str) -> str:
+    def _transit_time_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
         """Generate transit time validation query"""
-        vessel_filter = self._build_vessel_filter(claim.vessel)
-        route_filter = self._build_route_filter(claim.route)
-        period_filter = self._build_period_filter(claim.period, quarter)
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel, alias='e1')
+        period_filter, period_params = self._build_period_filter(claim.period, quarter, alias='e1')
+        transit_route_filter, transit_route_params = self._build_route_filter_transit(claim.route)
         
         return f"""
         WITH transit_calculations AS (
@@ -273,65 +587,104 @@ class ValidationQueryGenerator:
             JOIN port_trace pt ON pt.imo = e1.imo
             WHERE e1.next_port = e2.portname
             AND e2.start > e1.end
+            AND e2.start < e1.end + INTERVAL 61 DAY
             AND TIMESTAMPDIFF(DAY, e1.end, e2.start) BETWEEN 1 AND 60
-            {vessel_filter.replace('e.', 'e1.')}
-            {period_filter.replace('e.', 'e1.')}
+            {vessel_filter}
+            {period_filter}
         )
-        SELECT 
-            imo,
-            vessel_name,
-            origin_port,
-            destination_port,
-            AVG(transit_days) as avg_transit_days,
-            STDDEV(transit_days) as transit_deviation,
-            COUNT(*) as voyage_count,
-            MIN(voyage_start) as period_start,
-            MAX(voyage_start) as period_end
-        FROM transit_calculations
-        WHERE 1=1 {self._build_route_filter_transit(claim.route)}
-        GROUP BY imo, vessel_name, origin_port, destination_port
-        HAVING voyage_count >= 2
+        SELECT *
+        FROM (
+            SELECT 
+                imo,
+                vessel_name,
+                origin_port,
+                destination_port,
+                AVG(transit_days) as avg_transit_days,
+                STDDEV(transit_days) as transit_deviation,
+                COUNT(*) as voyage_count,
+                MIN(voyage_start) as period_start,
+                MAX(voyage_start) as period_end
+            FROM transit_calculations
+            WHERE 1=1 {transit_route_filter}
+            GROUP BY imo, vessel_name, origin_port, destination_port
+            HAVING voyage_count >= 2
+        ) transits
         ORDER BY avg_transit_days DESC
         LIMIT 30
-        """
+        """, vessel_params + period_params + transit_route_params
     
-    def _route_pattern_query(self, claim: ValidationClaim, quarter: str) -> str:
-        """Generate route pattern validation query"""
-        vessel_filter = self._build_vessel_filter(claim.vessel)
-        period_filter = self._build_period_filter(claim.period, quarter)
+    def _route_pattern_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
+        """Generate route pattern validation query
+        
+        Returns the ordered port calls of the busiest matching vessels; patterns are
+        assembled client-side by _postprocess_route_pattern.
+        """
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel)
+        period_filter, period_params = self._build_period_filter(claim.period, quarter)
         
         return f"""
         SELECT 
             e.imo,
             v.name as vessel_name,
-            GROUP_CONCAT(
-                DISTINCT CONCAT(e.portname, '->', COALESCE(e.next_port, 'END'))
-                ORDER BY e.start 
-                SEPARATOR ' | '
-            ) as route_pattern,
-            COUNT(DISTINCT e.portname) as unique_ports,
-            COUNT(*) as total_calls,
-            GROUP_CONCAT(DISTINCT p.zone) as zones_visited,
-            AVG(m.co2nm / 3.2 / 1000) as avg_fuel_consumption
+            e.portname,
+            e.next_port,
+            e.start,
+            p.zone,
+            m.co2nm
         FROM escalas e
-        JOIN port_trace pt ON pt.imo = e.imo
+        JOIN (
+            SELECT e.imo
+            FROM escalas e
+            JOIN port_trace pt ON pt.imo = e.imo
+            JOIN v_fleet v ON e.imo = v.imo
+            WHERE 1=1
+            {vessel_filter}
+            {period_filter}
+            GROUP BY e.imo
+            HAVING COUNT(*) >= 3
+            ORDER BY COUNT(DISTINCT e.portname) DESC, COUNT(*) DESC
+            LIMIT 25
+        ) top_vessels ON top_vessels.imo = e.imo
         JOIN v_fleet v ON e.imo = v.imo
         LEFT JOIN v_MRV m ON e.imo = m.imo
         LEFT JOIN ports p ON e.portname = p.portname
         WHERE 1=1
         {vessel_filter}
         {period_filter}
-        GROUP BY e.imo, v.name
-        HAVING total_calls >= 3
-        ORDER BY unique_ports DESC, total_calls DESC
-        LIMIT 25
-        """
+        ORDER BY e.imo, e.start
+        """, (vessel_params + period_params) * 2
     
-    def _port_frequency_query(self, claim: ValidationClaim, quarter: str) -> str:
+    def _postprocess_route_pattern(self, columns: List[str], rows: List[tuple]) -> Tuple[List[str], List[tuple]]:
+        """Aggregate ordered port calls into one route pattern row per vessel"""
+        if not rows:
+            return list(columns), []
+        
+        calls = pd.DataFrame(list(rows), columns=columns)
+        # A NULL port would make the whole leg NaN and break the pattern join
+        calls['leg'] = calls['portname'].fillna('UNKNOWN') + '->' + calls['next_port'].fillna('END')
+        calls['co2nm'] = pd.to_numeric(calls['co2nm'], errors='coerce')
+        
+        patterns = calls.groupby('imo', sort=False).agg(
+            vessel_name=('vessel_name', 'first'),
+            # Distinct legs and zones in first-seen (chronological) order
+            route_pattern=('leg', lambda legs: ' | '.join(dict.fromkeys(legs))),
+            unique_ports=('portname', 'nunique'),
+            total_calls=('portname', 'size'),
+            zones_visited=('zone', lambda zones: ','.join(dict.fromkeys(zones.dropna()))),
+            avg_fuel_consumption=('co2nm', 'mean')
+        )
+        patterns['avg_fuel_consumption'] = patterns['avg_fuel_consumption'] / 3.2 / 1000
+        patterns = patterns.sort_values(['unique_ports', 'total_calls'], ascending=False, kind='stable').reset_index()
+        
+        # Native Python values (None for missing) so rows look like the other queries' results
+        patterns = patterns.astype(object).where(patterns.notna(), None)
+        return list(patterns.columns), [tuple(row) for row in patterns.to_dict('split')['data']]
+    
+    def _port_frequency_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
         """Generate port frequency validation query"""
-        vessel_filter = self._build_vessel_filter(claim.vessel)
-        route_filter = self._build_route_filter(claim.route)
-        period_filter = self._build_period_filter(claim.period, quarter)
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel)
+        route_filter, route_params = self._build_route_filter(claim.route)
+        period_filter, period_params = self._build_period_filter(claim.period, quarter)
         
         return f"""
         SELECT 
@@ -341,9 +694,8 @@ class ValidationQueryGenerator:
             COUNT(DISTINCT e.imo) as unique_vessels,
             COUNT(*) as total_calls
         FROM escalas e
-        STRAIGHT_JOIN port_trace pt ON pt.imo = e.imo
         LEFT JOIN ports p ON e.portname = p.portname
-        WHERE 1=1
+        WHERE EXISTS (SELECT 1 FROM port_trace pt WHERE pt.imo = e.imo)
         {vessel_filter}
         {route_filter}
         {period_filter}
@@ -351,13 +703,13 @@ class ValidationQueryGenerator:
         HAVING total_calls >= 5
         ORDER BY total_calls DESC
         LIMIT 20
-        """
+        """, vessel_params + route_params + period_params
     
-    def _vessel_movement_query(self, claim: ValidationClaim, quarter: str) -> str:
+    def _vessel_movement_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
         """Generate general vessel movement query"""
-        vessel_filter = self._build_vessel_filter(claim.vessel)
-        route_filter = self._build_route_filter(claim.route)
-        period_filter = self._build_period_filter(claim.period, quarter)
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel)
+        route_filter, route_params = self._build_route_filter(claim.route)
+        period_filter, period_params = self._build_period_filter(claim.period, quarter)
         
         return f"""
         SELECT 
@@ -381,138 +733,216 @@ class ValidationQueryGenerator:
         {period_filter}
         ORDER BY e.start DESC
         LIMIT 100
-        """
+        """, vessel_params + route_params + period_params
     
-    def _general_movement_query(self, claim: ValidationClaim, quarter: str) -> str:
+    def _general_movement_query(self, claim: ValidationClaim, quarter: str) -> Tuple[str, List[Any]]:
         """Fallback general movement query"""
         return self._vessel_movement_query(claim, quarter)
     
-    def _build_vessel_filter(self, vessel_info: Optional[str]) -> str:
+    def _fuel_consumption_slice_query(self, claim: ValidationClaim, table: str) -> Tuple[str, List[Any]]:
+        """CO2 emissions validation query against a period slice"""
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel, name_column='e.name')
+        route_filter, route_params = self._build_route_filter(claim.route)
+        
+        return f"""
+        SELECT *
+        FROM (
+            SELECT 
+                e.imo,
+                e.name as vessel_name,
+                e.co2nm,
+                COUNT(*) as voyage_count,
+                MIN(e.start) as period_start,
+                MAX(e.start) as period_end
+            FROM {table} e
+            LEFT JOIN ports p_start ON e.portname = p_start.portname
+            LEFT JOIN ports p_end ON e.next_port = p_end.portname
+            WHERE e.fleet_imo IS NOT NULL
+            AND e.co2nm IS NOT NULL
+            AND e.co2nm > 0
+            {vessel_filter}
+            {route_filter}
+            GROUP BY e.imo, e.name, e.co2nm
+            HAVING voyage_count >= 2
+        ) grouped
+        ORDER BY co2nm DESC
+        LIMIT 50
+        """, vessel_params + route_params
+    
+    def _port_frequency_slice_query(self, claim: ValidationClaim, table: str) -> Tuple[str, List[Any]]:
+        """Port frequency validation query against a period slice"""
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel, name_column='e.name')
+        route_filter, route_params = self._build_route_filter(claim.route)
+        
+        return f"""
+        SELECT 
+            e.portname,
+            p.country,
+            p.zone,
+            COUNT(DISTINCT e.imo) as unique_vessels,
+            COUNT(*) as total_calls
+        FROM {table} e
+        LEFT JOIN ports p ON e.portname = p.portname
+        WHERE 1=1
+        {vessel_filter}
+        {route_filter}
+        GROUP BY e.portname, p.country, p.zone
+        HAVING total_calls >= 5
+        ORDER BY total_calls DESC
+        LIMIT 20
+        """, vessel_params + route_params
+    
+    def _vessel_movement_slice_query(self, claim: ValidationClaim, table: str) -> Tuple[str, List[Any]]:
+        """Vessel movement query against a period slice"""
+        vessel_filter, vessel_params = self._build_vessel_filter(claim.vessel, name_column='e.name')
+        route_filter, route_params = self._build_route_filter(claim.route)
+        
+        return f"""
+        SELECT 
+            e.imo,
+            e.name as vessel_name,
+            e.portname,
+            e.next_port,
+            e.start,
+            e.end,
+            e.co2nm / 3.2 / 1000 as fuel_consumption,
+            p.country,
+            p.zone
+        FROM {table} e
+        LEFT JOIN ports p ON e.portname = p.portname
+        WHERE e.fleet_imo IS NOT NULL
+        {vessel_filter}
+        {route_filter}
+        ORDER BY e.start DESC
+        LIMIT 100
+        """, vessel_params + route_params
+    
+    def _build_vessel_filter(self, vessel_info: Optional[str], alias: str = 'e',
+                             name_column: str = 'v.name') -> Tuple[str, List[Any]]:
         """Build vessel filter clause"""
         if not vessel_info:
-            return ""
+            return "", []
         
         # Check if it looks like an IMO number (7 digits)
         if vessel_info.isdigit() and len(vessel_info) == 7:
-            return f"AND e.imo = {vessel_info}"
+            return f"AND {alias}.imo = %s", [int(vessel_info)]
         elif vessel_info.strip():
             # Search by vessel name (partial match)
-            # Double %% to escape for pymysql parameter handling
-            return f"AND v.name LIKE '%%{vessel_info}%%'"
+            name_clause, params = _like(name_column, vessel_info)
+            return f"AND {name_clause}", params
         
-        return ""
+        return "", []
     
-    def _build_route_filter(self, route_info: Optional[str]) -> str:
+    def _build_route_filter(self, route_info: Optional[str]) -> Tuple[str, List[Any]]:
         """Build route filter clause"""
         if not route_info:
-            return ""
-        
-        # Handle dict input (from LLM extraction)
-        if isinstance(route_info, dict):
-            if 'ports' in route_info and route_info['ports']:
-                ports = route_info['ports']
-                if isinstance(ports, list) and ports:
-                    # Double %% to escape for pymysql parameter handling
-                    port_conditions = " OR ".join([f"e.portname LIKE '%%{p}%%'" for p in ports])
-                    return f" AND ({port_conditions})"
-            return ""
+            return "", []
         
-        route_info = route_info.strip()
+        if not isinstance(route_info, dict):
+            route_info = route_info.strip()
         
-        # Handle specific port-to-port routes
+        return getattr(self, self._ROUTE_FILTERS[self._route_kind(route_info)])(route_info)
+    
+    @staticmethod
+    def _route_kind(route_info) -> str:
+        """Classify a route description: port list, port pair, region pair or single place"""
+        # Dict input comes from LLM extraction
+        if isinstance(route_info, dict):
+            return 'ports'
         if '->' in route_info:
-            ports = [p.strip() for p in route_info.split('->')]
-            if len(ports) >= 2:
-                origin, destination = ports[0], ports[1]
-                # Double %% to escape for pymysql parameter handling
-                return f"""
-                AND (e.portname LIKE '%%{origin}%%' OR e.portname LIKE '%%{destination}%%')
-                AND (e.next_port LIKE '%%{origin}%%' OR e.next_port LIKE '%%{destination}%%')
-                """
-        
-        # Handle regional routes like "Asia-Europe"
-        elif '-' in route_info and not route_info.replace('-', '').isdigit():
-            regions = [r.strip() for r in route_info.split('-')]
-            if len(regions) >= 2:
-                region1, region2 = regions[0], regions[1]
-                # Double %% to escape for pymysql parameter handling
-                return f"""
-                AND (p_start.zone LIKE '%%{region1}%%' OR p_start.zone LIKE '%%{region2}%%'
-                     OR p_end.zone LIKE '%%{region1}%%' OR p_end.zone LIKE '%%{region2}%%')
-                """
-        
-        # General port/region search
-        else:
-            # Double %% to escape for pymysql parameter handling
-            return f"""
-            AND (e.portname LIKE '%%{route_info}%%' 
-                 OR e.next_port LIKE '%%{route_info}%%'
-                 OR p.zone LIKE '%%{route_info}%%')
-            """
-        
-        return ""
+            return 'port_pair'
+        if '-' in route_info and not route_info.replace('-', '').isdigit():
+            return 'regions'
+        return 'single'
+    
+    def _ports_route_filter(self, route_info: dict) -> Tuple[str, List[Any]]:
+        """Calls at any of an explicit list of ports"""
+        ports = route_info.get('ports')
+        if isinstance(ports, list) and ports:
+            # Partial matches, since stored names carry suffixes like "ROTTERDAM (NL)"
+            places, params = _like_any([('e.portname', port) for port in ports])
+            return f"AND {places}", params
+        return "", []
     
-    def _build_route_filter_transit(self, route_info: Optional[str]) -> str:
+    def _port_pair_route_filter(self, route_info: str) -> Tuple[str, List[Any]]:
+        """Port-to-port routes like Singapore -> Rotterdam"""
+        origin, destination = [p.strip() for p in route_info.split('->')][:2]
+        departs, departs_params = _like_any([('e.portname', origin), ('e.portname', destination)])
+        arrives, arrives_params = _like_any([('e.next_port', origin), ('e.next_port', destination)])
+        return f"AND {departs} AND {arrives}", departs_params + arrives_params
+    
+    def _regions_route_filter(self, route_info: str) -> Tuple[str, List[Any]]:
+        """Regional routes like Asia-Europe"""
+        region1, region2 = [r.strip() for r in route_info.split('-')][:2]
+        zones, params = _like_any([
+            ('p_start.zone', region1), ('p_start.zone', region2),
+            ('p_end.zone', region1), ('p_end.zone', region2)
+        ])
+        return f"AND {zones}", params
+    
+    def _single_route_filter(self, route_info: str) -> Tuple[str, List[Any]]:
+        """General port/region search"""
+        places, params = _like_any([('e.portname', route_info), ('e.next_port', route_info), ('p.zone', route_info)])
+        return f"AND {places}", params
+    
+    def _build_route_filter_transit(self, route_info: Optional[str]) -> Tuple[str, List[Any]]:
         """Build route filter for transit time queries"""
         if not route_info:
-            return ""
+            return "", []
         
         # Handle dict input (from LLM extraction)
         if isinstance(route_info, dict):
-            if 'ports' in route_info and route_info['ports']:
-                ports = route_info['ports']
-                if isinstance(ports, list) and len(ports) >= 2:
-                    # Double %% to escape for pymysql parameter handling
-                    return f"""
-                    AND origin_port LIKE '%%{ports[0]}%%'
-                    AND destination_port LIKE '%%{ports[1]}%%'
-                    """
-            return ""
-        
-        if '->' in route_info:
-            ports = [p.strip() for p in route_info.split('->')]
-            if len(ports) >= 2:
+            ports = route_info.get('ports')
+            if isinstance(ports, list) and len(ports) >= 2:
                 origin, destination = ports[0], ports[1]
-                # Double %% to escape for pymysql parameter handling
-                return f"""
-                AND origin_port LIKE '%%{origin}%%'
-                AND destination_port LIKE '%%{destination}%%'
-                """
+            else:
+                return "", []
+        elif '->' in route_info:
+            origin, destination = [p.strip() for p in route_info.split('->')][:2]
+        else:
+            places, params = _like_any([('origin_port', route_info), ('destination_port', route_info)])
+            return f"AND {places}", params
         
-        # Double %% to escape for pymysql parameter handling
-        return f"AND (origin_port LIKE '%%{route_info}%%' OR destination_port LIKE '%%{route_info}%%')"
+        origin_clause, origin_params = _like('origin_port', origin)
+        destination_clause, destination_params = _like('destination_port', destination)
+        return f"AND {origin_clause} AND {destination_clause}", origin_params + destination_params
     
-    def _build_period_filter(self, period_info: Optional[str], default_quarter: str) -> str:
+    def _build_period_filter(self, period_info: Optional[str], default_quarter: str,
+                             alias: str = 'e') -> Tuple[str, List[Any]]:
         """Build time period filter clause"""
         target_period = period_info or default_quarter
         
         if not target_period:
-            return ""
+            return "", []
         
-        # Handle quarter format like "2024Q1"
-        if 'Q' in target_period.upper():
-            return f"AND CONCAT(YEAR(e.start), 'Q', QUARTER(e.start)) = '{target_period.upper()}'"
+        # Quarters like "2024Q1" and years like "2024" become a range on the indexed start column
+        bounds = _period_bounds(target_period)
+        if bounds:
+            return f"AND {alias}.start >= %s AND {alias}.start < %s", list(bounds)
         
-        # Handle year format like "2024"
-        elif len(target_period) == 4 and target_period.isdigit():
-            return f"AND YEAR(e.start) = {target_period}"
+        # Unrecognized quarter notation
+        if 'Q' in target_period.upper():
+            return f"AND CONCAT(YEAR({alias}.start), 'Q', QUARTER({alias}.start)) = %s", [target_period.upper()]
         
         # Handle date format (basic)
         else:
-            return f"AND e.start >= '{target_period}'"
+            return f"AND {alias}.start >= %s", [target_period]
 
 class ValidationAnalyzer:
     """Analyzes validation results using LLM"""
     
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, cache: Optional[ExtractionCache] = None):
         self.llm = llm
+        self.cache = cache or ExtractionCache(os.path.join('data', 'analysis_cache'))
         self.analysis_prompt = self._create_analysis_prompt()
+        self._system_message, self._human_template = _render_prompt(self.analysis_prompt)
+        self.structured_llm = _structured_llm(llm, ClaimAnalyses, 'etso_analysis_v1')
     
     def _create_analysis_prompt(self) -> ChatPromptTemplate:
         return ChatPromptTemplate.from_messages([
             ("system", """You are a maritime data analyst validating research claims against vessel traffic data.
             
-            Analyze the database results and determine:
+            For each claim, analyze its database results and determine:
             1. Does the data support the claim? (Yes/No/Partially)
             2. Confidence level (0.0 to 1.0)
             3. Key evidence from the data
@@ -520,101 +950,140 @@ class ValidationAnalyzer:
             
             Be objective and quantitative in your analysis."""),
             ("human", """
-            Original Claim: {claim}
-            
-            Database Query Results ({num_results} records):
-            {results}
+            {claims}
             
-            Analyze whether the data supports this claim and provide:
-            - Support Level: Yes/No/Partially
-            - Confidence: 0.0-1.0
-            - Evidence: Key supporting data points
-            - Limitations: Any data gaps or contradictions
-            
-            Format as:
-            SUPPORT: [Yes/No/Partially]
-            CONFIDENCE: [0.0-1.0]
-            EVIDENCE: [Key supporting evidence]
-            LIMITATIONS: [Any limitations or contradictions]
+            Return one analysis per claim, using the claim's number as claim_index.
             """)
         ])
     
-    def analyze_validation_results(self, claim: ValidationClaim, query_results: List[tuple]) -> Dict[str, Any]:
+    def analyze_validation_results(self, claim: ValidationClaim, query_results: List[tuple],
+                                   columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """Analyze validation query results"""
-        try:
-            # Format results for LLM analysis
-            results_text = self._format_results_for_analysis(query_results)
-            
-            response = self.llm.invoke(
-                self.analysis_prompt.format_messages(
-                    claim=claim.claim_text,
-                    num_results=len(query_results),
-                    results=results_text
-                )
+        return self.analyze_claims_batch([(claim, query_results, columns)])[0]
+    
+    async def aanalyze_validation_results(self, claim: ValidationClaim, query_results: List[tuple],
+                                          columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async variant of analyze_validation_results"""
+        return (await self.aanalyze_claims_batch([(claim, query_results, columns)]))[0]
+    
+    def analyze_claims_batch(self, pairs: List[Tuple[ValidationClaim, List[tuple], Optional[List[str]]]]) -> List[Dict[str, Any]]:
+        """Analyze several (claim, query_results, columns) triples in a single LLM call"""
+        analyses, missing = self._cached_analyses(pairs)
+        if missing:
+            try:
+                parsed = _invoke_structured(self.structured_llm, self._format_messages(pairs, missing))
+                self._fill_analyses(analyses, pairs, missing, parsed)
+            except Exception as e:
+                logger.error(f"❌ Analysis failed: {e}")
+                for i in missing:
+                    analyses[i] = self._failed_analysis(e, pairs[i][1])
+        return analyses
+    
+    async def aanalyze_claims_batch(self, pairs: List[Tuple[ValidationClaim, List[tuple], Optional[List[str]]]]) -> List[Dict[str, Any]]:
+        """Async variant of analyze_claims_batch"""
+        analyses, missing = self._cached_analyses(pairs)
+        if missing:
+            try:
+                parsed = await _ainvoke_structured(self.structured_llm, self._format_messages(pairs, missing))
+                self._fill_analyses(analyses, pairs, missing, parsed)
+            except Exception as e:
+                logger.error(f"❌ Analysis failed: {e}")
+                for i in missing:
+                    analyses[i] = self._failed_analysis(e, pairs[i][1])
+        return analyses
+    
+    def _cached_analyses(self, pairs: List[Tuple[ValidationClaim, List[tuple], Optional[List[str]]]]) -> Tuple[List[Optional[Dict]], List[int]]:
+        """Look every pair up in the cache, returning the analyses found and the indexes still missing"""
+        # Claims without matching data can't be supported, so they never reach the LLM
+        analyses = [self.cache.get(self._cache_key(claim, results, columns)) if results else self._no_data_analysis()
+                    for claim, results, columns in pairs]
+        return analyses, [i for i, analysis in enumerate(analyses) if analysis is None]
+    
+    def _fill_analyses(self, analyses: List[Optional[Dict]],
+                       pairs: List[Tuple[ValidationClaim, List[tuple], Optional[List[str]]]],
+                       missing: List[int], parsed: ClaimAnalyses):
+        """Map structured analyses back onto their pairs by claim number"""
+        by_number = {analysis.claim_index: analysis for analysis in parsed.analyses}
+        for number, i in enumerate(missing, start=1):
+            claim, query_results, columns = pairs[i]
+            if number not in by_number:
+                analyses[i] = self._failed_analysis('claim missing from analysis response', query_results)
+                continue
+            analyses[i] = self._analysis_from_parsed(by_number[number], query_results)
+            self.cache.set(self._cache_key(claim, query_results, columns), analyses[i])
+    
+    def _format_messages(self, pairs: List[Tuple[ValidationClaim, List[tuple], Optional[List[str]]]],
+                         indexes: List[int]) -> List[BaseMessage]:
+        sections = []
+        for number, i in enumerate(indexes, start=1):
+            claim, query_results, columns = pairs[i]
+            sections.append(
+                f"Claim {number}: {claim.claim_text}\n\n"
+                f"Database Query Results ({len(query_results)} records):\n"
+                f"{self._format_results_for_analysis(query_results, columns)}"
             )
-            
-            # Parse analysis response
-            analysis = self._parse_analysis_response(response.content)
-            
-            return {
-                'supports_claim': analysis.get('support', 'No').lower() in ['yes', 'partially'],
-                'confidence': float(analysis.get('confidence', 0.0)),
-                'evidence': analysis.get('evidence', ''),
-                'limitations': analysis.get('limitations', ''),
-                'analysis_text': response.content,
-                'data_points': len(query_results)
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Analysis failed: {e}")
-            return {
-                'supports_claim': False,
-                'confidence': 0.0,
-                'evidence': '',
-                'limitations': f'Analysis error: {e}',
-                'analysis_text': '',
-                'data_points': len(query_results)
-            }
+        human = self._human_template.format(claims='\n\n'.join(sections))
+        return [self._system_message, HumanMessage(content=human)]
     
-    def _format_results_for_analysis(self, results: List[tuple]) -> str:
-        """Format query results for LLM analysis"""
-        if not results:
-            return "No matching data found"
-        
-        # Show up to 10 results for analysis
-        formatted_results = []
-        for i, row in enumerate(results[:10]):
-            formatted_results.append(f"Record {i+1}: {row}")
-        
-        if len(results) > 10:
-            formatted_results.append(f"... and {len(results) - 10} more records")
-        
-        return '\n'.join(formatted_results)
+    def _cache_key(self, claim: ValidationClaim, query_results: List[tuple], columns: Optional[List[str]]) -> str:
+        return ExtractionCache.make_key(_model_name(self.llm), claim.claim_text, repr((columns, query_results)))
     
-    def _parse_analysis_response(self, response_text: str) -> Dict[str, str]:
-        """Parse structured analysis response"""
-        analysis = {}
+    def _analysis_from_parsed(self, analysis: ClaimAnalysis, query_results: List[tuple]) -> Dict[str, Any]:
+        # Keep the SUPPORT/CONFIDENCE/... text layout stored in validation_claims.analysis_text
+        analysis_text = (
+            f"SUPPORT: {analysis.support}\n"
+            f"CONFIDENCE: {analysis.confidence}\n"
+            f"EVIDENCE: {analysis.evidence}\n"
+            f"LIMITATIONS: {analysis.limitations}"
+        )
         
-        # Extract structured fields
-        patterns = {
-            'support': r'SUPPORT:\s*(.+?)(?:\n|$)',
-            'confidence': r'CONFIDENCE:\s*([0-9.]+)',
-            'evidence': r'EVIDENCE:\s*(.+?)(?:\nLIMITATIONS:|$)',
-            'limitations': r'LIMITATIONS:\s*(.+?)(?:\n|$)'
+        return {
+            'supports_claim': analysis.support.lower() in ['yes', 'partially'],
+            'confidence': analysis.confidence,
+            'evidence': analysis.evidence,
+            'limitations': analysis.limitations,
+            'analysis_text': analysis_text,
+            'data_points': len(query_results)
         }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, response_text, re.DOTALL | re.IGNORECASE)
-            if match:
-                analysis[key] = match.group(1).strip()
-        
-        return analysis
+    
+    def _no_data_analysis(self) -> Dict[str, Any]:
+        return {
+            'supports_claim': False,
+            'confidence': 0.0,
+            'evidence': '',
+            'limitations': 'No matching data found',
+            'analysis_text': "SUPPORT: No\nCONFIDENCE: 0.0\nEVIDENCE: \nLIMITATIONS: No matching data found",
+            'data_points': 0
+        }
+    
+    def _failed_analysis(self, error: Any, query_results: List[tuple]) -> Dict[str, Any]:
+        return {
+            'supports_claim': False,
+            'confidence': 0.0,
+            'evidence': '',
+            'limitations': f'Analysis error: {error}',
+            'analysis_text': '',
+            'data_points': len(query_results)
+        }
+    
+    def _format_results_for_analysis(self, results: List[tuple], columns: Optional[List[str]] = None) -> str:
+        """Format query results for LLM analysis"""
+        return _summarize_rows(results, columns)
 
 class DualDatabaseValidator:
     """Main validation system using both databases"""
     
-    def __init__(self, db_manager: DatabaseManager, llm: ChatOpenAI):
+    # Claims of one period needed before materializing a shared slice beats querying escalas per claim
+    MIN_CLAIMS_PER_SLICE = 3
+    
+    def __init__(self, db_manager: DatabaseManager, llm: ChatOpenAI, max_concurrent_claims: Optional[int] = None,
+                 embeddings: Optional[Embeddings] = None):
         self.db_manager = db_manager
+        self.max_concurrent_claims = max_concurrent_claims or db_manager.config.research.VALIDATION_CONCURRENCY
+        
+        # Semantic claim cache is only used when an embedding model is supplied
+        self.embeddings = embeddings
+        self.claim_cache = SemanticClaimCache(os.path.join('data', 'sem_cache')) if embeddings else None
         self.traffic_access = TrafficDataAccess(db_manager)
         self.etso_access = ETSODataAccess(db_manager)
         
@@ -630,26 +1099,84 @@ class DualDatabaseValidator:
         
         logger.info(f"🔍 Starting validation for research ID: {research_metadata_id}")
         
+        # 1. Extract verifiable claims
+        claims = self.claim_extractor.extract_claims(research_content, validation_targets)
+        return asyncio.run(self._validate_claims(research_metadata_id, claims))
+    
+    async def avalidate_research_findings(self, findings: List[Dict[str, Any]],
+                                          max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Validate several findings, extracting all of their claims in one concurrent LLM batch
+        
+        Each finding is a dict with research_metadata_id, research_content and validation_targets.
+        """
+        
+        logger.info(f"🔍 Starting validation for {len(findings)} research findings")
+        
+        # 1. Extract verifiable claims for every finding at once
+        all_claims = await self.claim_extractor.aextract_claims_batch(
+            [(finding['research_content'], finding['validation_targets']) for finding in findings],
+            max_concurrency=max_concurrency
+        )
+        
+        # 2-4. Validate each finding's claims
+        results = []
+        for finding, claims in zip(findings, all_claims):
+            logger.info(f"🔍 Starting validation for research ID: {finding['research_metadata_id']}")
+            results.append(await self._validate_claims(finding['research_metadata_id'], claims, persist_cache=False))
+        
+        # Persist the semantic claim cache once for the whole batch
+        if self.claim_cache is not None:
+            await self.claim_cache.asave()
+        
+        return results
+    
+    async def _validate_claims(self, research_metadata_id: int, claims: List[ValidationClaim],
+                               persist_cache: bool = True) -> Dict[str, Any]:
+        """Validate extracted claims concurrently, then score and record the finding"""
+        
         try:
-            # 1. Extract verifiable claims
-            claims = self.claim_extractor.extract_claims(research_content, validation_targets)
-            
             if not claims:
                 logger.warning("⚠️  No verifiable claims extracted")
                 return {'overall_confidence': 0.0, 'validation_results': []}
             
-            # 2. Validate each claim
-            validation_results = []
-            for i, claim in enumerate(claims):
-                logger.info(f"🔎 Validating claim {i+1}/{len(claims)}: {claim.claim_type}")
-                result = self._validate_single_claim(claim, research_metadata_id)
-                validation_results.append(result)
+            # 2. Skip claims too vague to query, and reuse validations of semantically equivalent claims
+            vectors = await self._embed_claims(claims)
+            reused = [self._skip_claim(claim) or self._reuse_claim(claim, vector)
+                      for claim, vector in zip(claims, vectors)]
+            
+            # 3. Query traffic data for the remaining claims concurrently, bounded so the DB pool isn't flooded
+            semaphore = asyncio.Semaphore(self.max_concurrent_claims)
+            pending = [i for i, outcome in enumerate(reused) if outcome is None]
+            queried = list(reused)
+            for group_outcomes in await asyncio.gather(*[
+                self._query_claim_group(claims, indexes, period, semaphore)
+                for period, indexes in self._group_claim_queries(claims, pending)
+            ]):
+                for i, outcome in group_outcomes:
+                    queried[i] = outcome
             
-            # 3. Calculate overall confidence
+            # 4. Analyze every queried claim in a single LLM call
+            analyzable = [i for i, outcome in enumerate(queried) if outcome['status'] == 'queried']
+            analyses = dict(zip(analyzable, await self.analyzer.aanalyze_claims_batch(
+                [(claims[i], queried[i]['data_results'], queried[i]['columns']) for i in analyzable]
+            ))) if analyzable else {}
+            
+            # 5. Record each claim's validation
+            validation_results = list(await asyncio.gather(*[
+                self._record_claim(research_metadata_id, queried[i], analyses.get(i, queried[i].get('analysis')))
+                for i in range(len(claims))
+            ]))
+            self._remember_claims(claims, vectors, reused, validation_results)
+            if persist_cache and self.claim_cache is not None:
+                await self.claim_cache.asave()
+            
+            # 6. Calculate overall confidence
             overall_confidence = self._calculate_overall_confidence(validation_results)
             
-            # 4. Update research metadata
-            self.etso_access.update_research_confidence(research_metadata_id, overall_confidence)
+            # 7. Update research metadata
+            await asyncio.to_thread(
+                self.etso_access.update_research_confidence, research_metadata_id, overall_confidence
+            )
             
             logger.info(f"✅ Validation completed. Overall confidence: {overall_confidence:.3f}")
             
@@ -665,18 +1192,100 @@ class DualDatabaseValidator:
             logger.error(f"❌ Validation failed: {e}")
             return {'overall_confidence': 0.0, 'validation_results': [], 'error': str(e)}
     
-    def _validate_single_claim(self, claim: ValidationClaim, research_metadata_id: int) -> Dict[str, Any]:
-        """Validate a single claim against traffic database"""
+    def _group_claim_queries(self, claims: List[ValidationClaim],
+                             pending: List[int]) -> List[Tuple[Optional[str], List[int]]]:
+        """Group claims that can share a materialized slice of their period; the rest are queried alone"""
+        by_period: Dict[str, List[int]] = {}
+        for i in pending:
+            if self.query_generator.supports_slice(claims[i]):
+                by_period.setdefault(claims[i].period or "2025Q1", []).append(i)
         
-        try:
-            # Generate validation query
-            query = self.query_generator.generate_validation_query(claim, claim.period or "2025Q1")
+        groups = [(period, indexes) for period, indexes in by_period.items()
+                  if len(indexes) >= self.MIN_CLAIMS_PER_SLICE]
+        grouped = {i for _, indexes in groups for i in indexes}
+        return groups + [(None, [i]) for i in pending if i not in grouped]
+    
+    async def _query_claim_group(self, claims: List[ValidationClaim], indexes: List[int], period: Optional[str],
+                                 semaphore: asyncio.Semaphore) -> List[Tuple[int, Dict[str, Any]]]:
+        """Query a group of claims, through a shared period slice when one is given"""
+        if period is not None:
+            async with semaphore:
+                logger.info(f"🔎 Validating {len(indexes)} claims against a shared {period} slice")
+                outcomes = await asyncio.to_thread(self._query_on_period_slice, period, [claims[i] for i in indexes])
+            if outcomes is not None:
+                return list(zip(indexes, outcomes))
+        
+        return list(zip(indexes, await asyncio.gather(*[
+            self._query_claim(claims[i], semaphore, i, len(claims)) for i in indexes
+        ])))
+    
+    def _query_on_period_slice(self, period: str, claims: List[ValidationClaim]) -> Optional[List[Dict[str, Any]]]:
+        """Materialize the period's port calls once and run every claim's query against them"""
+        period_filter, period_params = self.query_generator.period_slice_filter(period)
+        
+        with self.traffic_access.period_slice(period_filter, period_params) as period_slice:
+            if period_slice is None:
+                return None
+            table, run = period_slice
             
-            # Execute query against traffic database
-            results = self.db_manager.execute_traffic_query(query)
+            outcomes = []
+            for claim in claims:
+                try:
+                    slice_query, slice_params = self.query_generator.generate_slice_query(claim, table)
+                    columns, rows = self.query_generator.postprocess(claim, *run(slice_query, tuple(slice_params)))
+                    
+                    # Record the equivalent escalas query, which stays runnable once the slice is dropped
+                    query, params = self.query_generator.generate_validation_query(claim, period)
+                    outcomes.append({
+                        'claim': claim,
+                        'query': self.query_generator.render(query, params),
+                        'data_results': rows,
+                        'columns': columns,
+                        'status': 'queried'
+                    })
+                except Exception as e:
+                    logger.error(f"❌ Single claim validation failed: {e}")
+                    outcomes.append(self._failed_claim(claim, e))
+            return outcomes
+    
+    async def _query_claim(self, claim: ValidationClaim, semaphore: asyncio.Semaphore,
+                           index: int, total: int) -> Dict[str, Any]:
+        """Run a claim's validation query against the traffic database"""
+        
+        try:
+            async with semaphore:
+                logger.info(f"🔎 Validating claim {index+1}/{total}: {claim.claim_type}")
+                
+                # Generate validation query
+                query, params = self.query_generator.generate_validation_query(claim, claim.period or "2025Q1")
+                
+                # Execute query against traffic database (blocking driver, so off the event loop)
+                columns, rows = await self.traffic_access.aquery_cached(query, tuple(params))
+                columns, results = self.query_generator.postprocess(claim, columns, rows)
+                
+                # Keep a runnable copy of the query for the dashboard and the stored claim
+                return {
+                    'claim': claim,
+                    'query': self.query_generator.render(query, params),
+                    'data_results': results,
+                    'columns': columns,
+                    'status': 'queried'
+                }
             
-            # Analyze results with LLM
-            analysis = self.analyzer.analyze_validation_results(claim, results)
+        except Exception as e:
+            logger.error(f"❌ Single claim validation failed: {e}")
+            return self._failed_claim(claim, e)
+    
+    async def _record_claim(self, research_metadata_id: int, queried: Dict[str, Any],
+                            analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store an analyzed claim in the ETSO database"""
+        
+        claim = queried['claim']
+        if queried['status'] in ('failed', 'skipped'):
+            return queried
+        
+        try:
+            query, results = queried['query'], queried['data_results']
             
             # Store validation result in ETSO database
             claim_data = {
@@ -693,7 +1302,7 @@ class DualDatabaseValidator:
                 'analysis_text': analysis['analysis_text']
             }
             
-            self.etso_access.store_validation_claim(claim_data)
+            await asyncio.to_thread(self.etso_access.store_validation_claim, claim_data)
             
             return {
                 'claim': claim,
@@ -707,35 +1316,90 @@ class DualDatabaseValidator:
             
         except Exception as e:
             logger.error(f"❌ Single claim validation failed: {e}")
-            return {
-                'claim': claim,
-                'error': str(e),
-                'confidence': 0.0,
-                'supports_claim': False,
-                'status': 'failed'
-            }
+            return self._failed_claim(claim, e)
+    
+    async def _embed_claims(self, claims: List[ValidationClaim]) -> List[Optional[np.ndarray]]:
+        """Embed claim texts in one request, or return no vectors when the cache is disabled"""
+        if self.claim_cache is None:
+            return [None] * len(claims)
+        try:
+            embeddings = await self.embeddings.aembed_documents([claim.claim_text for claim in claims])
+            return [SemanticClaimCache.normalize(embedding) for embedding in embeddings]
+        except Exception as e:
+            logger.warning(f"⚠️  Claim embedding failed, validating without the semantic cache: {e}")
+            return [None] * len(claims)
+    
+    def _claim_scope(self, claim: ValidationClaim) -> str:
+        """Cache scope: the claim's rendered validation query, so reuse only happens when the SQL is identical"""
+        query, params = self.query_generator.generate_validation_query(claim, claim.period or "2025Q1")
+        rendered = self.query_generator.render(query, params)
+        return hashlib.blake2b(' '.join(rendered.split()).encode(), digest_size=16).hexdigest()
+    
+    def _skip_claim(self, claim: ValidationClaim) -> Optional[Dict[str, Any]]:
+        """Outcome for a claim naming no vessel, route or period, whose query would just sample escalas"""
+        if claim.vessel or claim.route or claim.period:
+            return None
+        logger.info(f"ℹ️  Skipping claim without vessel, route or period: {claim.claim_text[:60]}")
+        return {
+            'claim': claim,
+            'confidence': 0.0,
+            'supports_claim': False,
+            'analysis': {'data_points': 0},
+            'status': 'skipped'
+        }
+    
+    def _reuse_claim(self, claim: ValidationClaim, vector: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Build a ready-to-record outcome from a cached equivalent claim, if there is one"""
+        if vector is None:
+            return None
+        cached = self.claim_cache.lookup(self._claim_scope(claim), vector)
+        if cached is None:
+            return None
+        logger.info(f"♻️  Reusing validation of an equivalent claim: {claim.claim_text[:60]}")
+        return {
+            'claim': claim,
+            'query': cached['query'],
+            'data_results': [],
+            'analysis': cached['analysis'],
+            'status': 'cached'
+        }
+    
+    def _remember_claims(self, claims: List[ValidationClaim], vectors: List[Optional[np.ndarray]],
+                         reused: List[Optional[Dict[str, Any]]], validation_results: List[Dict[str, Any]]):
+        """Add freshly validated claims to the semantic cache (persisted by the caller)"""
+        if self.claim_cache is None:
+            return
+        
+        for claim, vector, outcome, result in zip(claims, vectors, reused, validation_results):
+            if vector is None or outcome is not None or result['status'] != 'validated':
+                continue
+            self.claim_cache.add(self._claim_scope(claim), vector,
+                                 {'query': result['query'], 'analysis': result['analysis']})
+    
+    def _failed_claim(self, claim: ValidationClaim, error: Exception) -> Dict[str, Any]:
+        return {
+            'claim': claim,
+            'error': str(error),
+            'confidence': 0.0,
+            'supports_claim': False,
+            'status': 'failed'
+        }
     
     def _calculate_overall_confidence(self, validation_results: List[Dict]) -> float:
         """Calculate overall confidence from individual validations"""
         
-        if not validation_results:
+        validated = [result for result in validation_results if result['status'] == 'validated']
+        if not validated:
             return 0.0
         
-        # Weight by data points and support
-        total_weight = 0
-        weighted_confidence = 0
+        count = len(validated)
+        data_points = np.fromiter((r['analysis']['data_points'] for r in validated), dtype=np.float64, count=count)
+        support = np.fromiter((1.5 if r.get('supports_claim', False) else 1.0 for r in validated),
+                              dtype=np.float64, count=count)
+        confidence = np.fromiter((r['confidence'] for r in validated), dtype=np.float64, count=count)
         
-        for result in validation_results:
-            if result['status'] == 'validated':
-                # Weight by number of data points (more data = higher weight)
-                data_weight = min(result['analysis']['data_points'] * 0.1 + 1.0, 3.0)
-                
-                # Boost weight if claim is supported
-                support_weight = 1.5 if result.get('supports_claim', False) else 1.0
-                
-                final_weight = data_weight * support_weight
-                
-                weighted_confidence += result['confidence'] * final_weight
-                total_weight += final_weight
+        # Weight by number of data points (more data = higher weight), boosted if the claim is supported
+        weights = np.minimum(data_points * 0.1 + 1.0, 3.0) * support
         
-        return min(weighted_confidence / total_weight if total_weight > 0 else 0.0, 1.0)
\ No newline at end of file
+        total_weight = weights.sum()
+        return min(float((confidence * weights).sum() / total_weight) if total_weight > 0 else 0.0, 1.0)
\ No newline at end of file